@@ -11,16 +11,29 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+# 기동 시간 측정 (다른 import 보다 먼저)
+from common.startup_report import STARTUP
+
+with STARTUP.phase("import:fastapi"):
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import traceback
 import asyncio
 
-from src.app_context import AppContext
+with STARTUP.phase("import:app"):
+    from src.app_context import AppContext, CompressionConfig, LLMResilienceConfig
+    from common.compression import CompressionMiddleware
+    from common.deadline import DeadlineMiddleware
+    from common.metrics import MetricsMiddleware
+    from common.responses import ORJSONResponse
+    from common.trace_context import TraceMiddleware
+
+    from service.basic.basic_api import router as basic_router
+    from service.ai.llm_api import router as llm_router
+
 
-from service.basic.basic_api import router as basic_router
-from service.ai.llm_api import router as llm_router
+LOCAL_CONFIG = "src/service/conf/bangtori_ai.local.cfg.json"
 
 
 class AppFactory:
@@ -58,17 +71,30 @@ class AppFactory:
                 await AppFactory._shutdown(app)
 
         
-        app = FastAPI(lifespan=lifespan)
+        # dict 반환도 orjson 으로 직렬화
+        app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
         
         # 컨텍스트 초기화
         ctx = AppContext()
         app.state.ctx = ctx
         
-        # 설정 로드
-        ctx.load_config("src/service/conf/bangtori_ai.local.cfg.json")
+        # 설정 로드 (운영 launcher 는 BANGTORI_CONFIG 로 prod 설정 지정)
+        ctx.load_config(os.environ.get("BANGTORI_CONFIG", LOCAL_CONFIG))
 
         # CORS 설정
         AppFactory._setup_cors(app, ctx)
+
+        # 응답 압축 (Accept-Encoding 협상, SSE 제외)
+        AppFactory._setup_compression(app, ctx)
+
+        # 요청 deadline 설정
+        AppFactory._setup_deadline(app, ctx)
+
+        # 요청 수 / 소요 시간 메트릭
+        AppFactory._setup_metrics(app, ctx)
+
+        # 요청 trace id 설정 (가장 바깥 미들웨어 → 모든 로그에 trace id 포함)
+        AppFactory._setup_tracing(app, ctx)
         
         # 라우터 등록
         AppFactory._register_routes(app)
@@ -88,6 +114,44 @@ class AppFactory:
         )
         print(f"CORS configuration complete: {cors_config.allow_origins}")
     
+    @staticmethod
+    def _setup_compression(app: FastAPI, ctx: AppContext) -> None:
+        """zstd / gzip 응답 압축 미들웨어 설정 (리포트 / batch 응답 대역폭 절감)"""
+        conf = getattr(ctx.cfg, "compression", None) or CompressionConfig()
+        if not conf.enabled:
+            print("Response compression disabled")
+            return
+
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=conf.minimum_size,
+            encodings=conf.encodings,
+            gzip_level=conf.gzip_level,
+            zstd_level=conf.zstd_level,
+            registry=ctx.metrics,
+        )
+        print(f"Response compression configuration complete: {conf.encodings} (>= {conf.minimum_size} bytes)")
+
+    @staticmethod
+    def _setup_deadline(app: FastAPI, ctx: AppContext) -> None:
+        """요청별 deadline 미들웨어 설정 (LLM 호출 timeout / 재시도 한도로 전달)"""
+        llm_conf = getattr(ctx.cfg, "llm", None)
+        conf = (llm_conf and llm_conf.resilience) or LLMResilienceConfig()
+        app.add_middleware(DeadlineMiddleware, default_timeout=conf.request_deadline)
+        print(f"Request deadline configuration complete: {conf.request_deadline}s")
+
+    @staticmethod
+    def _setup_metrics(app: FastAPI, ctx: AppContext) -> None:
+        """HTTP 요청 메트릭 미들웨어 설정 (/metrics 는 basic_api 에서 노출)"""
+        app.add_middleware(MetricsMiddleware, registry=ctx.metrics)
+        print("Metrics configuration complete")
+
+    @staticmethod
+    def _setup_tracing(app: FastAPI, ctx: AppContext) -> None:
+        """요청별 trace id 미들웨어 설정 (로거는 startup 이후 생성되므로 호출 시점에 조회)"""
+        app.add_middleware(TraceMiddleware, log=lambda: ctx.log)
+        print("Request tracing configuration complete")
+
     @staticmethod
     def _register_routes(app: FastAPI) -> None:
         """라우터 등록"""
@@ -107,8 +171,15 @@ class AppFactory:
 
             # 초기화 후 연결 설정
             # await AppFactory._initialize_handlers(ctx)
-            await AppFactory._initialize_managers(ctx)
-            await AppFactory._initialize_algorithms(ctx)
+            with ctx.startup.phase("startup:managers"):
+                await AppFactory._initialize_managers(ctx)
+            with ctx.startup.phase("startup:algorithms"):
+                await AppFactory._initialize_algorithms(ctx)
+            with ctx.startup.phase("startup:schedulers"):
+                await AppFactory._initialize_schedulers(ctx)
+
+            # provider SDK 등 무거운 준비는 백그라운드 (완료 시 /ready 가 200)
+            ctx._start_warmup()
             
             ctx.log.info("     == Initialization complete")
 
@@ -131,13 +202,26 @@ class AppFactory:
         print("     - Initializing handlers...")   
         ctx._init_logger()
         AppFactory._test_logging(ctx.log)
+        ctx._init_metrics()
+        ctx._init_http_client()
+        ctx._init_telemetry_cache()
         
     @staticmethod
     async def _initialize_algorithms(ctx: AppContext) -> None:
         """알고리즘 초기화"""
         print("     - Initializing algorithms...")   
+        ctx._init_criteria()
+        ctx._init_rollups()
         ctx._init_llms()
+        ctx._init_batch()
     
+    @staticmethod
+    async def _initialize_schedulers(ctx: AppContext) -> None:
+        """백그라운드 작업 초기화"""
+        print("     - Initializing schedulers...")
+        ctx._init_ingest()
+        ctx._init_reports()
+
     @staticmethod
     async def _shutdown(app: FastAPI) -> None:
         """애플리케이션 종료 시 정리"""
@@ -146,6 +230,56 @@ class AppFactory:
         if hasattr(ctx, 'log') and ctx.log:
             ctx.log.info("     -- Shutting down application")
 
+        # 진행 중인 warmup 중단 (readiness 도 해제)
+        await ctx._close_warmup()
+
+        # 리포트 스케줄러 / 저장소 정리
+        try:
+            await ctx._close_reports()
+        except Exception as e:
+            if ctx.log:
+                ctx.log.warning(f"     - Report scheduler cleanup failed: {e}")
+
+        # telemetry push 수신 중단
+        try:
+            await ctx._close_ingest()
+        except Exception as e:
+            if ctx.log:
+                ctx.log.warning(f"     - Telemetry ingest cleanup failed: {e}")
+
+        # LLM provider 정리 (provider 가 직접 만든 HTTP 클라이언트)
+        if getattr(ctx, "llm_manager", None):
+            try:
+                await ctx.llm_manager.aclose()
+            except Exception as e:
+                ctx.log.warning(f"     - LLM provider cleanup failed: {e}")
+
+        # LLM 응답 캐시 정리
+        if getattr(ctx, "llm_manager", None) and ctx.llm_manager.cache:
+            try:
+                ctx.llm_manager.cache.close()
+            except Exception as e:
+                ctx.log.warning(f"     - LLM cache cleanup failed: {e}")
+
+        # telemetry 공유 캐시 정리
+        if getattr(ctx, "telemetry_cache", None):
+            try:
+                ctx.telemetry_cache.close()
+            except Exception as e:
+                ctx.log.warning(f"     - Telemetry cache cleanup failed: {e}")
+
+        # 공용 HTTP 클라이언트 정리
+        try:
+            await ctx._close_http_client()
+        except Exception as e:
+            if ctx.log:
+                ctx.log.warning(f"     - HTTP client cleanup failed: {e}")
+
+        # 로그 큐 비우기 + listener 쓰레드 종료 (마지막에)
+        if getattr(ctx, "log", None):
+            ctx.log.info("     -- Shutdown complete")
+            ctx.log.close()
+
         # # LLM 모델 정리
         # if hasattr(ctx, "llm_models") and ctx.llm_models:
         #     try:
@@ -166,7 +300,8 @@ class AppFactory:
         logger.info("===FILE LOG TEST END===")
 
 # 애플리케이션 인스턴스 생성
-app = AppFactory.create_app()
+with STARTUP.phase("create_app"):
+    app = AppFactory.create_app()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,202 @@
+# src/common/compression.py
+#
+# 응답 압축 (ASGI)
+# - Accept-Encoding 협상: 서버 선호 순서 (기본 zstd → gzip), q=0 인 인코딩은 제외
+# - 한 번에 끝나는 응답: minimum_size 이상이면 전체를 한 번에 압축 (Content-Length 갱신)
+# - 스트림 응답 (batch NDJSON 등): 조각마다 flush 해서 바로 전송 (Content-Length 제거)
+# - text/event-stream (SSE) / 이미 인코딩된 응답 / 텍스트가 아닌 응답은 그대로
+# - zstandard 가 없으면 gzip 만 사용
+# - 압축 대상 형식의 응답은 압축 여부 (협상 결과 / 크기) 와 관계없이 Vary: Accept-Encoding
+#   (공유 캐시가 비압축 응답을 gzip 을 받는 클라이언트에게, 또는 그 반대로 주지 않도록)
+
+import gzip
+import zlib
+from typing import Iterable, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+ACCEPT_ENCODING = b"accept-encoding"
+_TEXT_TYPES = ("text/", "application/json", "application/x-ndjson", "application/javascript", "application/xml")
+
+
+def negotiate(accept: str, offered: Tuple[str, ...]) -> Optional[str]:
+    """Accept-Encoding 에서 q 가 가장 높은 인코딩 (같으면 offered 순서)"""
+    best, best_rank = None, None
+    for part in accept.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip()
+        if name not in offered:
+            continue
+
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        if q <= 0:
+            continue
+
+        rank = (-q, offered.index(name))
+        if best_rank is None or rank < best_rank:
+            best, best_rank = name, rank
+    return best
+
+
+class _StreamCompressor:
+    """스트림 응답용 (응답마다 새로 생성, 조각마다 flush)"""
+
+    def __init__(self, encoding: str, gzip_level: int, zstd_level: int):
+        if encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+            self._flush, self._finish = zstandard.COMPRESSOBJ_FLUSH_BLOCK, zstandard.COMPRESSOBJ_FLUSH_FINISH
+        else:
+            self._obj = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)     # wbits 31 → gzip 헤더
+            self._flush, self._finish = zlib.Z_SYNC_FLUSH, zlib.Z_FINISH
+
+    def compress(self, data: bytes, more: bool) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(self._flush if more else self._finish)
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        encodings: Iterable[str] = ("zstd", "gzip"),
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+        skip_types: Iterable[str] = ("text/event-stream",),
+        registry=None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = tuple(e for e in encodings if e == "gzip" or (e == "zstd" and zstandard is not None))
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self.skip_types = tuple(skip_types)
+        # 한 번에 압축하는 경우는 await 없이 끝나므로 이벤트 루프 안에서 공유해도 안전
+        self._zstd = zstandard.ZstdCompressor(level=zstd_level) if "zstd" in self.encodings else None
+
+        self.responses = self.bytes = None
+        if registry is not None:
+            self.responses = registry.counter(
+                "bangtori_http_compressed_responses_total", "Compressed HTTP responses", ["encoding"]
+            )
+            self.bytes = registry.counter(
+                "bangtori_http_compressed_bytes_total", "Response bytes before / after compression", ["stage"]
+            )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        for name, value in scope.get("headers", ()):
+            if name == ACCEPT_ENCODING:
+                encoding = negotiate(value.decode("latin-1"), self.encodings)
+                break
+
+        await self.app(scope, receive, _CompressingSend(self, send, encoding))
+
+    def compressible_type(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type.startswith(_TEXT_TYPES) and not content_type.startswith(self.skip_types)
+
+    def compressible(self, headers: Headers, size: int, more: bool) -> bool:
+        return self.compressible_type(headers) and (more or size >= self.minimum_size)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "zstd":
+            return self._zstd.compress(body)
+        return gzip.compress(body, self.gzip_level, mtime=0)
+
+    def record(self, encoding: Optional[str], before: int, after: int) -> None:
+        if self.bytes is None:
+            return
+        if encoding is not None:
+            self.responses.inc(encoding)
+        self.bytes.inc("in", amount=before)
+        self.bytes.inc("out", amount=after)
+
+
+class _CompressingSend:
+    """첫 body 를 보고 압축 여부 결정 (그때까지 response.start 는 보류)"""
+
+    __slots__ = ("mw", "send", "encoding", "start", "stream")
+
+    def __init__(self, mw: CompressionMiddleware, send, encoding: Optional[str]):
+        self.mw = mw
+        self.send = send
+        self.encoding = encoding
+        self.start = None
+        self.stream: Optional[_StreamCompressor] = None
+
+    async def __call__(self, message):
+        kind = message["type"]
+        if kind == "http.response.start":
+            if self.encoding is None:
+                # 협상된 인코딩이 없으면 압축하지 않으므로 보류 없이 Vary 만 추가
+                headers = MutableHeaders(scope=message)
+                if self.mw.compressible_type(headers):
+                    headers.add_vary_header("Accept-Encoding")
+                await self.send(message)
+                return
+            self.start = message
+            return
+        if kind != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self._begin(start, message)
+            return
+
+        if self.stream is None:
+            # 압축하지 않기로 한 응답의 나머지 조각
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+        data = self.stream.compress(body, more)
+        self.mw.record(None, len(body), len(data))
+        await self.send({"type": "http.response.body", "body": data, "more_body": more})
+
+    async def _begin(self, start, message) -> None:
+        headers = MutableHeaders(scope=start)
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+        if not self.mw.compressible(headers, len(body), more):
+            if self.mw.compressible_type(headers):
+                headers.add_vary_header("Accept-Encoding")
+            await self.send(start)
+            await self.send(message)
+            return
+
+        if more:
+            mw = self.mw
+            self.stream = _StreamCompressor(self.encoding, mw.gzip_level, mw.zstd_level)
+            data = self.stream.compress(body, more=True)
+            if "content-length" in headers:
+                del headers["content-length"]
+        else:
+            data = self.mw.compress(self.encoding, body)
+            headers["content-length"] = str(len(data))
+
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        self.mw.record(self.encoding, len(body), len(data))
+
+        await self.send(start)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more})
@@ -0,0 +1,74 @@
+# src/common/deadline.py
+#
+# 요청 단위 deadline (contextvars)
+# - DeadlineMiddleware 가 요청마다 절대 마감 시각을 설정
+# - 하위 호출(LLM provider 등)은 remaining() 으로 남은 시간을 확인해 timeout / 재시도 여부 결정
+# - 요청 처리 중 생성된 task 도 context 를 복사하므로 마감 시각이 그대로 전달됨
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+DEADLINE_HEADER = b"x-request-timeout"     # 클라이언트가 지정하는 남은 시간 (초)
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def remaining() -> Optional[float]:
+    """남은 시간 (초), deadline 이 없으면 None"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """
+    with 블록 안에서 deadline 을 seconds 후로 설정 (None 이면 해제)
+    바깥 deadline 이 더 이르면 바깥 값을 유지
+    """
+    if seconds is None:
+        token = _deadline.set(None)
+    else:
+        new = time.monotonic() + seconds
+        outer = _deadline.get()
+        token = _deadline.set(new if outer is None else min(outer, new))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class DeadlineMiddleware:
+    """
+    요청마다 deadline 설정 (ASGI)
+    X-Request-Timeout 헤더가 있으면 default 와 비교해 더 짧은 값 사용
+    """
+
+    def __init__(self, app, default_timeout: float):
+        self.app = app
+        self.default_timeout = default_timeout
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timeout = self.default_timeout
+        for name, value in scope.get("headers", ()):
+            if name == DEADLINE_HEADER:
+                try:
+                    timeout = min(timeout, max(float(value), 0.0))
+                except ValueError:
+                    pass
+                break
+
+        with deadline_scope(timeout):
+            await self.app(scope, receive, send)
@@ -0,0 +1,240 @@
+# src/common/metrics.py
+#
+# 경량 메트릭 (Prometheus text exposition 0.0.4)
+# - Counter / Gauge / Histogram: 라벨 값 tuple → 숫자, 이벤트 루프 단일 쓰레드에서 갱신하므로 lock 없음
+# - span(stage): 구간 소요 시간을 stage_duration_seconds{stage=...} 히스토그램에 기록
+# - collector: /metrics 조회 시점에만 다른 객체의 통계(dict)를 읽어 노출 (평소 비용 없음)
+# - MetricsMiddleware: 요청 수 / 소요 시간 / 진행 중 요청 수
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# collector 가 반환하는 샘플: (메트릭 이름, 타입, 도움말, 라벨, 값)
+Sample = Tuple[str, str, str, Dict[str, str], float]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_labels(self.label_names, k)} {_number(v)}" for k, v in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple, float] = {}
+
+    def set(self, *label_values, value: float) -> None:
+        self._values[label_values] = value
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) - amount
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_labels(self.label_names, k)} {_number(v)}" for k, v in self._values.items()
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 값 → [버킷별 개수..., +Inf 개수], 합계
+        self._counts: Dict[Tuple, List[int]] = {}
+        self._sums: Dict[Tuple, float] = {}
+
+    def observe(self, *label_values, value: float) -> None:
+        counts = self._counts.get(label_values)
+        if counts is None:
+            counts = self._counts[label_values] = [0] * (len(self.buckets) + 1)
+            self._sums[label_values] = 0.0
+        # 해당 버킷에만 더하고 누적은 출력 시 계산
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[label_values] += value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(self._sums[key])}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+        self.stage_duration = self.histogram(
+            "bangtori_stage_duration_seconds", "Duration of internal processing stages", ["stage"]
+        )
+        self.stage_errors = self.counter(
+            "bangtori_stage_errors_total", "Internal processing stages that raised", ["stage"]
+        )
+
+    def _register(self, metric: _Metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            # 미들웨어 스택이 다시 만들어지는 경우 등 같은 정의면 기존 메트릭 재사용
+            if type(existing) is not type(metric) or existing.label_names != metric.label_names:
+                raise ValueError(f"metric '{metric.name}' already registered with a different definition")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Iterable[str] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def register_collector(self, fn: Callable[[], Iterable[Sample]]) -> None:
+        self._collectors.append(fn)
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.stage_errors.inc(stage)
+            raise
+        finally:
+            self.stage_duration.observe(stage, value=time.perf_counter() - started)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+
+        # collector 샘플은 메트릭 이름별로 묶어 HELP / TYPE 한 번만 출력
+        grouped: Dict[str, Tuple[str, str, List[str]]] = {}
+        for collect in self._collectors:
+            try:
+                samples = list(collect())
+            except Exception:
+                continue
+            for name, kind, help, labels, value in samples:
+                if value is None:
+                    continue
+                entry = grouped.setdefault(name, (kind, help, []))
+                label_str = _labels(tuple(labels), tuple(labels.values()))
+                entry[2].append(f"{name}{label_str} {_number(value)}")
+
+        for name, (kind, help, samples) in grouped.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+        return "\n".join(lines) + "\n"
+
+
+def span(ctx, stage: str):
+    """ctx.metrics 가 있으면 구간 측정, 없으면 아무것도 하지 않음"""
+    metrics = getattr(ctx, "metrics", None)
+    return metrics.span(stage) if metrics is not None else nullcontext()
+
+
+class MetricsMiddleware:
+    """요청 수 / 소요 시간 / 진행 중 요청 수 (ASGI), route 라벨은 경로 템플릿 기준"""
+
+    def __init__(self, app, registry: MetricsRegistry, skip_paths: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+        self.requests = registry.counter(
+            "bangtori_http_requests_total", "HTTP requests", ["method", "route", "status"]
+        )
+        self.duration = registry.histogram(
+            "bangtori_http_request_duration_seconds", "HTTP request duration (until response body completes)",
+            ["method", "route"]
+        )
+        self.in_flight = registry.gauge("bangtori_http_requests_in_flight", "HTTP requests in progress")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        self.in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.in_flight.dec()
+            route = self._route(scope)
+            self.requests.inc(scope["method"], route, str(status))
+            self.duration.observe(scope["method"], route, value=time.perf_counter() - started)
+
+    @staticmethod
+    def _route(scope) -> str:
+        # 라우팅 후 scope 에 기록된 경로 템플릿 (매칭 실패 시 고정 값 → 라벨 수 폭증 방지)
+        route = scope.get("route")
+        path = getattr(route, "path", None)
+        return path or "<unmatched>"
@@ -0,0 +1,22 @@
+# src/common/responses.py
+#
+# orjson 기반 JSON 응답
+# - 앱 기본 응답 클래스 (FastAPI(default_response_class=ORJSONResponse))
+# - dict 를 그대로 반환하면 FastAPI 가 jsonable_encoder 로 한 번 더 순회하므로
+#   자주 호출되는 엔드포인트는 ORJSONResponse(...) 를 직접 반환 (직렬화 1회)
+# - numpy 값 (점수 엔진 결과 등) / 숫자 key 도 그대로 직렬화
+# (fastapi.responses.ORJSONResponse 는 deprecated 이므로 사용하지 않음)
+
+from typing import Any
+
+import orjson
+from starlette.responses import JSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
@@ -0,0 +1,57 @@
+# src/common/single_flight.py
+#
+# 동일 키로 동시에 들어온 비동기 호출을 하나의 in-flight task 로 합침
+#   N 개의 동시 요청 → 실제 호출 1회, 나머지는 같은 결과를 await
+# - 공유 task 는 요청 deadline 없이 실행 (첫 호출자의 deadline 이 다른 대기자에게 적용되지 않도록)
+#   각 호출자는 자신의 deadline 까지만 기다리고, 먼저 포기해도 task 는 다른 대기자를 위해 계속 실행
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from common import deadline
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.shared = 0     # 다른 호출의 결과를 받아간 횟수
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        on_deadline: Optional[Callable[[], BaseException]] = None,
+    ) -> Any:
+        """
+        on_deadline: 호출자의 deadline 이 먼저 지났을 때 던질 예외 (없으면 asyncio.TimeoutError)
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            # task 는 생성 시점의 context 를 복사하므로 deadline 을 해제한 상태에서 생성
+            with deadline.deadline_scope(None):
+                task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+
+        # 한 호출자가 취소되어도 다른 대기자를 위해 task 자체는 유지
+        left = deadline.remaining()
+        if left is None:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), max(left, 0.0))
+        except asyncio.TimeoutError:
+            if on_deadline is None:
+                raise
+            raise on_deadline() from None
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 대기자가 모두 취소된 경우 "exception was never retrieved" 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,69 @@
+# src/common/sqlite_store.py
+#
+# 프로세스 간 공유 SQLite 저장소
+# - 워커 여러 개가 같은 파일을 쓰므로 WAL (읽기와 쓰기 동시 진행) + busy timeout (쓰기 잠금 대기)
+# - SQLiteTTLStore: 만료 시각이 있는 key → value 저장소 (LLM 응답 / telemetry 2차 캐시)
+#   이벤트 루프를 막지 않도록 호출 측에서 asyncio.to_thread 로 사용 (쓰레드 간은 lock 으로 직렬화)
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+
+def connect_shared(path: str, busy_timeout: float = 5.0) -> sqlite3.Connection:
+    store_dir = os.path.dirname(path)
+    if store_dir:
+        os.makedirs(store_dir, exist_ok=True)
+
+    conn = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL 에서는 NORMAL 이어도 커밋 단위 일관성 유지 (전원 장애 시 마지막 커밋만 유실 가능)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SQLiteTTLStore:
+    def __init__(self, path: str, table: str):
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+
+        self._conn = connect_shared(path)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.purge_expired()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] <= time.time():
+            # 만료된 행은 purge_expired 에서 한 번에 정리 (읽기 경로에서는 쓰기 잠금을 잡지 않음)
+            return None
+        return row[0]
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cur = self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+            return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
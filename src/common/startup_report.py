@@ -0,0 +1,65 @@
+# src/common/startup_report.py
+#
+# 기동 시간 측정
+# - phase(name): import / create_app / startup / warmup 등 구간별 소요 시간 기록
+# - timed_import(module): 지연 import (provider SDK 등) 를 처음 불러올 때 걸린 시간 기록
+# - 모듈 단위 상세 분석은 `python -X importtime src/bangtori_ai.py` 사용
+#   (import 시점에는 ctx 가 없으므로 모듈 전역 STARTUP 에 기록)
+
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+class StartupReport:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}      # 이름 → 초 (기록 순서 유지)
+        self.imports: Dict[str, float] = {}     # 지연 import 모듈 → 초
+        self.ready_after: Optional[float] = None
+        self._lock = threading.Lock()           # 지연 import 는 worker 쓰레드에서도 기록
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def timed_import(self, module: str):
+        """모듈을 import 하고, 처음 불러온 경우에만 소요 시간 기록"""
+        # sys.modules 만 보면 다른 쓰레드에서 초기화 중인 모듈을 받을 수 있으므로 항상 import_module 경유
+        first = module not in sys.modules
+        started = time.perf_counter()
+        loaded = importlib.import_module(module)
+        if first:
+            with self._lock:
+                self.imports.setdefault(module, time.perf_counter() - started)
+        return loaded
+
+    def mark_ready(self) -> None:
+        if self.ready_after is None:
+            self.ready_after = time.perf_counter() - self.started
+
+    def as_dict(self) -> dict:
+        return {
+            "phases": {k: round(v, 4) for k, v in self.phases.items()},
+            "lazy_imports": {k: round(v, 4) for k, v in self.imports.items()},
+            "ready_after": round(self.ready_after, 4) if self.ready_after is not None else None,
+            "modules_loaded": len(sys.modules),
+        }
+
+    def log(self, log) -> None:
+        for name, elapsed in self.phases.items():
+            log.info(f"[STARTUP] {name:<24} {elapsed * 1000:8.1f} ms")
+        for name, elapsed in self.imports.items():
+            log.info(f"[STARTUP] import {name:<17} {elapsed * 1000:8.1f} ms")
+        if self.ready_after is not None:
+            log.info(f"[STARTUP] ready after {self.ready_after:.3f}s ({len(sys.modules)} modules loaded)")
+
+
+STARTUP = StartupReport()
@@ -0,0 +1,76 @@
+# src/common/trace_context.py
+#
+# 요청 단위 trace id (contextvars)
+# - TraceMiddleware 가 요청마다 trace id 를 설정 (X-Trace-Id / X-Request-Id 헤더가 있으면 그대로 사용)
+# - 로그 레코드 / 백엔드 호출 헤더 / 응답 헤더에 같은 값이 실림
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from common.id_generator import generate_task_id
+
+TRACE_HEADER = "x-trace-id"
+_INCOMING_HEADERS = (b"x-trace-id", b"x-request-id")
+
+_trace_id: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
+
+
+def current_trace_id() -> Optional[str]:
+    return _trace_id.get()
+
+
+def set_trace_id(trace_id: Optional[str]):
+    """값을 설정하고 reset 용 token 반환"""
+    return _trace_id.set(trace_id)
+
+
+def reset_trace_id(token) -> None:
+    _trace_id.reset(token)
+
+
+class TraceMiddleware:
+    """
+    요청마다 trace id 설정 (ASGI) + 응답 헤더에 X-Trace-Id 추가
+    log 가 주어지면 요청 종료 시 method / path / status / 소요 시간을 debug 로 기록
+    """
+
+    def __init__(self, app, log=None):
+        self.app = app
+        self.log = log
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace_id = None
+        for name, value in scope.get("headers", ()):
+            if name in _INCOMING_HEADERS and value:
+                trace_id = value.decode("latin-1")[:128]
+                break
+
+        token = set_trace_id(trace_id or generate_task_id())
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_trace(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", ()))
+                headers.append((TRACE_HEADER.encode(), current_trace_id().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_trace)
+        finally:
+            log = self.log() if callable(self.log) else self.log
+            if log:
+                log.debug(
+                    "HTTP", f"{scope['method']} {scope['path']} {status}",
+                    method=scope["method"], path=scope["path"], status=status,
+                    elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+                )
+            reset_trace_id(token)
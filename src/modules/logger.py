@@ -1,107 +1,381 @@
 import os
+import queue
+import random
 import re
 import time
 import sys
+import zlib
 
-from datetime import datetime
 import logging
-from logging.handlers import TimedRotatingFileHandler
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+import orjson
+
+try:
+    import fcntl
+except ImportError:     # Windows: 워커 번호 대신 PID 사용
+    fcntl = None
+
+from common.trace_context import current_trace_id
 
 SUFFIX = "%Y%m%d"
 
+try:
+    import zstandard
+except ImportError:     # 압축 없이 로테이션만
+    zstandard = None
+
+
 class TimeSizeRotatingFileHandler(TimedRotatingFileHandler):
-    def getFilesToDelete(self):
-        dirName, baseName = os.path.split(self.baseFilename)
-        fileNames = os.listdir(dirName) if os.path.exists(dirName) else []
-        result = []
+    """
+    자정 또는 파일 크기(max_bytes) 초과 시 로테이션
+    - 백업 파일명: <base>.<YYYYMMDD>.<n>  (같은 날짜 안에서 n 증가)
+    - 로테이션된 파일은 백그라운드 쓰레드에서 zstd 압축 (<base>.<YYYYMMDD>.<n>.zst)
+    - 보존 기간(backupCount 일)은 메모리에 유지하는 날짜별 목록으로 관리 (디렉터리 스캔은 시작 시 1회)
+    """
 
-        for fileName in fileNames:
-            m = self.extMatch.search(fileName)
+    def __init__(self, filename, when="midnight", interval=1, backupCount=0, encoding=None,
+                 maxBytes=0, compress=True):
+        super().__init__(filename, when=when, interval=interval, backupCount=backupCount, encoding=encoding)
+        self.maxBytes = maxBytes
+        self.suffix = SUFFIX
+        self.extMatch = re.compile(
+            rf"^{re.escape(os.path.basename(self.baseFilename))}\.(\d{{8}})(?:\.(\d+))?(?:\.zst)?$"
+        )
+        self.compress = compress and zstandard is not None
+
+        # 날짜 → 백업 파일 경로 목록 (압축 전 이름 기준)
+        self._backups = {}
+        self._seq = {}
+        # 압축 / 삭제는 순서대로 처리되도록 쓰레드 1개
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-rotate")
+        self._load_backups()
+
+    def _load_backups(self):
+        dir_name = os.path.dirname(self.baseFilename)
+        found = []
+        for name in os.listdir(dir_name) if os.path.isdir(dir_name) else []:
+            m = self.extMatch.match(name)
             if m:
-                result.append(os.path.join(dirName, fileName))
-        
-        if len(result) > self.backupCount:
-            result.sort()
-            to_delete = result[:-self.backupCount]
-            return to_delete
-        return []
-    
+                found.append((m.group(1), int(m.group(2) or 0), name))
+
+        for label, seq, name in sorted(found):
+            path = os.path.join(dir_name, name)
+            if path.endswith(".zst"):
+                path = path[:-4]
+            elif self.compress:
+                # 압축 전에 종료된 백업
+                self._worker.submit(self._compress_file, path)
+            self._backups.setdefault(label, []).append(path)
+            self._seq[label] = max(self._seq.get(label, 0), seq)
+
+    def shouldRollover(self, record):
+        if int(time.time()) >= self.rolloverAt:
+            return True
+        if self.maxBytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            if self.stream.tell() >= self.maxBytes:
+                return True
+        return False
+
     def doRollover(self):
-        # get the time that this sequence started at and make it a TimeTuple
         currentTime = int(time.time())
-        t = self.rolloverAt - self.interval
-        if self.utc:
-            timeTuple = time.gmtime(t)
-        else:
-            timeTuple = time.localtime(t)
-            dstNow = time.localtime(currentTime)[-1]
-            dstThen = timeTuple[-1]
-            if dstNow != dstThen:
-                if dstNow:
-                    addend = 3600
-                else:
-                    addend = -3600
-                timeTuple = time.localtime(t + addend)
-
-        # 백업 파일명 생성
-        timestamp = datetime.now().strftime(self.suffix)
-        dfn = f"{self.baseFilename}.{timestamp}"
-
-        if os.path.exists(dfn):
-            return
+        timed = currentTime >= self.rolloverAt
+
+        # 시간 로테이션이면 끝난 구간의 날짜, 크기 로테이션이면 현재 날짜로 이름 지정
+        t = self.rolloverAt - self.interval if timed else currentTime
+        label = time.strftime(self.suffix, time.gmtime(t) if self.utc else time.localtime(t))
 
         if self.stream:
             self.stream.close()
             self.stream = None
-            
-        self.rotate(self.baseFilename, dfn)
-        
+
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            seq = self._seq.get(label, 0) + 1
+            self._seq[label] = seq
+            dfn = f"{self.baseFilename}.{label}.{seq}"
+            self.rotate(self.baseFilename, dfn)
+            self._backups.setdefault(label, []).append(dfn)
+
+            if self.compress:
+                self._worker.submit(self._compress_file, dfn)
+
         if self.backupCount > 0:
-            files_to_delete = self.getFilesToDelete()
-            for s in files_to_delete:
-                os.remove(s)
-                
+            expired = []
+            while len(self._backups) > self.backupCount:
+                # YYYYMMDD 문자열이므로 최솟값이 가장 오래된 날짜
+                expired.extend(self._backups.pop(min(self._backups)))
+            if expired:
+                self._worker.submit(self._delete_files, expired)
+
         if not self.delay:
             self.stream = self._open()
-            
-        self.rolloverAt = self.computeRollover(currentTime)
+
+        if timed:
+            self.rolloverAt = self.computeRollover(currentTime)
+
+    @staticmethod
+    def _compress_file(path):
+        tmp = path + ".zst.tmp"
+        try:
+            with open(path, "rb") as src, open(tmp, "wb") as dst:
+                zstandard.ZstdCompressor(level=3).copy_stream(src, dst)
+            os.replace(tmp, path + ".zst")
+            os.remove(path)
+        except Exception as e:
+            # 같은 로거로 기록하면 재귀가 될 수 있으므로 stderr 로만
+            sys.stderr.write(f"log compression failed for {path}: {e}\n")
+
+    @staticmethod
+    def _delete_files(paths):
+        for path in paths:
+            for candidate in (path, path + ".zst"):
+                try:
+                    os.remove(candidate)
+                except FileNotFoundError:
+                    pass
+
+    def close(self):
+        super().close()
+        # 진행 중인 압축이 끝날 때까지 대기
+        self._worker.shutdown(wait=True)
 
 class NoErrorFilter(logging.Filter):
     """ ERROR 이상의 로그를 제외하는 필터 """
     def filter(self, record):
         return record.levelno < logging.ERROR
 
+class TraceContextFilter(logging.Filter):
+    """호출한 쪽 context 의 trace id 를 레코드에 복사 (큐 모드에서 listener 쓰레드로 넘어가기 전에)"""
+    def filter(self, record):
+        record.trace_id = current_trace_id()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    레벨별 기록 비율 (예: {"debug": 0.1} → DEBUG 의 10% 만 기록)
+    trace id 가 있으면 trace id 기준으로 판정 → 한 요청의 로그는 모두 남거나 모두 빠짐
+    """
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = {getattr(logging, name.upper()): float(rate) for name, rate in (rates or {}).items()}
+
+    def filter(self, record):
+        rate = self.rates.get(record.levelno)
+        if rate is None or rate >= 1.0:
+            return True
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            return (zlib.crc32(trace_id.encode()) % 10000) < rate * 10000
+        return random.random() < rate
+
+class JSONFormatter(logging.Formatter):
+    """한 줄에 JSON 객체 하나 (ts, level, tag, msg, trace_id + 구조화 필드)"""
+    def format(self, record):
+        msg = record.msg
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc),
+            "level": record.levelname.lower(),
+        }
+        if isinstance(msg, _TaggedMessage):
+            entry["tag"] = msg.tag
+            entry["msg"] = str(msg.msg)
+        else:
+            entry["msg"] = record.getMessage()
+
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            entry["trace_id"] = trace_id
+
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+
+        return orjson.dumps(entry, default=str).decode()
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    로그 레코드를 제한된 크기의 큐에 넣기만 하는 핸들러 (포맷 / 파일 쓰기는 QueueListener 쓰레드에서)
+    큐가 가득 찼을 때
+      - drop : 새 레코드를 버리고 개수만 집계 (ERROR 이상은 block_timeout 동안 대기 후 시도)
+      - block: block_timeout 동안 대기, 그래도 가득 차 있으면 버림
+    버린 레코드 수는 큐에 여유가 생기면 WARNING 레코드로 한 번 알림
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = "drop", block_timeout: float = 0.05):
+        super().__init__(log_queue)
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unsupported log queue policy: {policy}")
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._unreported = 0
+
+    def prepare(self, record):
+        # 기본 구현은 여기서 메시지를 포맷함 → 포맷은 listener 쓰레드의 핸들러에 맡기고 레코드를 그대로 전달
+        return record
+
+    def enqueue(self, record):
+        try:
+            if self.policy == "block" or record.levelno >= logging.ERROR:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+            return
+
+        if self._unreported:
+            self._report_dropped(record)
+
+    def _report_dropped(self, record):
+        count, self._unreported = self._unreported, 0
+        notice = logging.LogRecord(
+            record.name, logging.WARNING, __file__, 0,
+            _TaggedMessage("LOG", f"dropped {count} records (queue full)"), None, None,
+        )
+        try:
+            self.queue.put_nowait(notice)
+        except queue.Full:
+            self._unreported += count
+
+
+class DrainingQueueListener(QueueListener):
+    """종료 신호를 큐에 자리가 날 때까지 기다려 넣음 (기본 구현은 큐가 가득 차 있으면 queue.Full)"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class _TaggedMessage:
+    """(tag, msg) 를 실제 출력 시점에만 문자열로 합침 (큐 모드에서는 listener 쓰레드에서)"""
+    __slots__ = ("tag", "msg")
+
+    def __init__(self, tag, msg):
+        self.tag = tag
+        self.msg = msg
+
+    def __str__(self):
+        tag_str = f"[{self.tag}]"
+        padding = " " * max(12 - len(tag_str), 1)
+        return f"{tag_str}{padding}{self.msg}"
+
+
 class CustomLogger:
-    def __init__(self, logger):
+    def __init__(self, logger, listener: QueueListener = None):
         self.logger = logger
+        self.listener = listener
 
     def _format(self, *args):
         if len(args) == 1:
             return args[0]
         elif len(args) >= 2:
-            tag, msg = args[0], args[1]
-            tag_str = f"[{tag}]"
-            padding = " " * max(12 - len(tag_str), 1)
-            return f"{tag_str}{padding}{msg}"
+            return _TaggedMessage(args[0], args[1])
         else:
             return ""
 
+    _LOG_KWARGS = ("exc_info", "stack_info", "stacklevel", "extra")
+
+    def _log(self, level, args, kwargs):
+        # 비활성 레벨이면 메시지 조합 없이 바로 반환
+        if not self.logger.isEnabledFor(level):
+            return
+
+        # logging 인자가 아닌 키워드는 구조화 필드로 (JSON 포맷에서 최상위 키)
+        fields = {k: kwargs.pop(k) for k in [k for k in kwargs if k not in self._LOG_KWARGS]}
+        if fields:
+            kwargs["extra"] = {**kwargs.get("extra", {}), "fields": fields}
+        self.logger.log(level, self._format(*args), **kwargs)
+
     def debug(self, *args, **kwargs):
-        self.logger.debug(self._format(*args), **kwargs)
+        self._log(logging.DEBUG, args, kwargs)
 
     def info(self, *args, **kwargs):
-        self.logger.info(self._format(*args), **kwargs)
+        self._log(logging.INFO, args, kwargs)
 
     def warning(self, *args, **kwargs):
-        self.logger.warning(self._format(*args), **kwargs)
+        self._log(logging.WARNING, args, kwargs)
 
     def error(self, *args, **kwargs):
-        self.logger.error(self._format(*args), **kwargs)
+        self._log(logging.ERROR, args, kwargs)
 
     def critical(self, *args, **kwargs):
-        self.logger.critical(self._format(*args), **kwargs)
+        self._log(logging.CRITICAL, args, kwargs)
+
+    @property
+    def dropped(self):
+        """큐가 가득 차 버려진 레코드 수"""
+        return sum(h.dropped for h in self.logger.handlers if isinstance(h, BoundedQueueHandler))
+
+    def close(self):
+        """
+        큐 모드일 때 남은 레코드를 모두 기록하고 listener 쓰레드 종료
+        파일 핸들러는 닫고 진행 중인 로테이션 압축이 끝날 때까지 대기 (이후 로그는 콘솔에만 동기 기록)
+        """
+        handlers = list(self.logger.handlers)
+        if self.listener is not None:
+            self.listener.stop()
+            for handler in [h for h in self.logger.handlers if isinstance(h, BoundedQueueHandler)]:
+                self.logger.removeHandler(handler)
+            handlers = list(self.listener.handlers)
+            self.listener = None
+
+        for handler in handlers:
+            if isinstance(handler, TimeSizeRotatingFileHandler):
+                self.logger.removeHandler(handler)
+                handler.close()
+            elif handler not in self.logger.handlers:
+                self.logger.addHandler(handler)
 
-def setup_logger(log_level, log_path, log_max_files):
+# 워커 번호 lock 파일 (프로세스가 살아있는 동안 열어둠 → 종료되면 OS 가 lock 해제)
+_worker_lock = None
+
+
+def claim_worker_slot(log_path):
+    """
+    워커별 로그 파일 번호 (0, 1, 2, ...)
+    - <log_path>.<n>.lock 을 비어있는 가장 작은 n 부터 flock 으로 선점
+    - 재시작 / 재생성된 워커는 종료된 워커의 번호를 이어받음 → 파일 수가 워커 수로 고정되고
+      같은 이름의 로그 파일이므로 보존 기간 정리도 그대로 적용
+    """
+    global _worker_lock
+    if fcntl is None:
+        return os.getpid()
+    if _worker_lock is not None:
+        return _worker_lock[0]
+
+    log_dir = os.path.dirname(log_path)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    slot = 0
+    while True:
+        fd = os.open(f"{log_path}.{slot}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            slot += 1
+            continue
+        _worker_lock = (slot, fd)
+        return slot
+
+
+def setup_logger(log_level, log_path, log_max_files, queue_size=0, queue_policy="drop", queue_block_timeout=0.05,
+                 max_bytes=0, compress=True, log_format="text", sampling=None):
+    """
+    queue_size > 0 이면 큐 모드: 로거에는 BoundedQueueHandler 만 붙이고
+    파일 / 콘솔 핸들러는 QueueListener 쓰레드에서 실행 (이벤트 루프에서 디스크 I/O 없음)
+    log_format: "text" (기존 형식) | "json" (orjson 한 줄 JSON)
+    sampling  : 레벨별 기록 비율, 예) {"debug": 0.1}
+    """
     logger = logging.getLogger('general_logger')
 
     # 기존 핸들러 제거
@@ -112,34 +386,38 @@ def setup_logger(log_level, log_path, log_max_files):
     log_level = getattr(logging, log_level.upper())
     logger.setLevel(log_level)
 
-    formatter = logging.Formatter(
-        '%(asctime)s.%(msecs)03d %(levelname)-8s %(message)s',
-        datefmt='%m/%d %H:%M:%S'
-    )
+    # trace id 복사 → 샘플링 순서 (둘 다 호출한 쪽 쓰레드에서 실행)
+    logger.filters.clear()
+    logger.addFilter(TraceContextFilter())
+    if sampling:
+        logger.addFilter(SamplingFilter(sampling))
+
+    if log_format == "json":
+        formatter = JSONFormatter()
+    else:
+        formatter = logging.Formatter(
+            '%(asctime)s.%(msecs)03d %(levelname)-8s %(message)s',
+            datefmt='%m/%d %H:%M:%S'
+        )
 
     log_filename = log_path.replace("-%DATE%", "")
     backup_count = int(log_max_files.replace("d", ""))
 
-    # 하루 단위 로테이션 설정 (테스트용)
+    log_dir = os.path.dirname(log_filename)
+    if log_dir:  # 빈 문자열이 아닐 때만 (핸들러가 파일을 열기 전에 생성)
+        os.makedirs(log_dir, exist_ok=True)
+
+    # 자정 + 크기 기준 로테이션, 보존 기간은 일 단위
     fileHandler = TimeSizeRotatingFileHandler(
         log_filename,
         when="midnight", 
         interval=1,
         backupCount=backup_count,
-        encoding="utf-8"
+        encoding="utf-8",
+        maxBytes=max_bytes,
+        compress=compress
     )
-    
-    # 백업 파일 매칭 정규식 설정
-    base_log_name = os.path.basename(log_filename)
-    escaped_base = re.escape(base_log_name)
 
-    log_dir = os.path.dirname(log_filename)
-    if log_dir:  # 빈 문자열이 아닐 때만
-        os.makedirs(log_dir, exist_ok=True)
-        
-    fileHandler.extMatch = re.compile(rf"{escaped_base}\.\d{{8}}$")
-    fileHandler.suffix = SUFFIX
-    
     fileHandler.setFormatter(formatter)
     fileHandler.setLevel(log_level)
     
@@ -154,13 +432,21 @@ def setup_logger(log_level, log_path, log_max_files):
     stderr_handler.setFormatter(formatter)
     stderr_handler.setLevel(logging.ERROR)
 
-    logger.addHandler(fileHandler)
-    logger.addHandler(stdout_handler)
-    logger.addHandler(stderr_handler)
+    handlers = [fileHandler, stdout_handler, stderr_handler]
 
     # 로거 전파 방지
     logger.propagate = False
 
+    if queue_size and queue_size > 0:
+        log_queue = queue.Queue(maxsize=queue_size)
+        logger.addHandler(BoundedQueueHandler(log_queue, queue_policy, queue_block_timeout))
+        listener = DrainingQueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        return CustomLogger(logger, listener)
+
+    for handler in handlers:
+        logger.addHandler(handler)
+
     return CustomLogger(logger)
 
 
@@ -0,0 +1,84 @@
+"""
+ Copyright (c) 2025. Ebee1205(wavicle) all rights reserved.
+
+ The copyright of this software belongs to Ebee1205(wavicle).
+ All rights reserved.
+"""
+
+# serve.py
+#
+# 운영 실행 진입점 (자동 reload 개발 서버는 bangtori_ai.py 의 __main__)
+# - 워커 수 / event loop / HTTP 파서 / 종료 대기 시간은 설정 파일의 server 항목
+# - 종료 신호를 받으면 새 연결은 받지 않고 진행 중인 요청 / 스트림을 graceful_timeout 까지 기다린 뒤
+#   각 워커의 lifespan shutdown (스케줄러 / 캐시 / 로그 정리) 실행
+# - 실행: python src/serve.py  (BANGTORI_CONFIG 미지정 시 prod 설정, PORT 가 있으면 그 포트 사용)
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from importlib.util import find_spec
+
+import orjson
+import uvicorn
+
+from src.app_context import AppConfig, ServerConfig
+
+PROD_CONFIG = "src/service/conf/bangtori_ai.prod.cfg.json"
+
+
+def _load_config(path: str) -> AppConfig:
+    # 워커를 띄우기 전에 전체 설정을 검증 (잘못된 설정이면 워커마다 실패하지 않도록)
+    with open(path, "rb") as f:
+        return AppConfig(**orjson.loads(f.read()))
+
+
+def _worker_count(conf: ServerConfig) -> int:
+    workers = int(os.environ.get("WEB_CONCURRENCY", conf.workers))
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def _implementation(name: str, package: str, fallback: str) -> str:
+    """지정한 구현 패키지가 없으면 기본 구현으로 대체 ("auto" 는 uvicorn 이 설치 여부로 선택)"""
+    if name == package and find_spec(package) is None:
+        print(f"!! {package} not installed; using {fallback}")
+        return fallback
+    return name
+
+
+def main() -> None:
+    config_path = os.environ.setdefault("BANGTORI_CONFIG", PROD_CONFIG)
+    cfg = _load_config(config_path)
+    conf = cfg.server or ServerConfig()
+
+    workers = _worker_count(conf)
+    # 워커 프로세스에서 프로세스별 로그 파일 사용 여부 판단용
+    os.environ["BANGTORI_WORKERS"] = str(workers)
+
+    loop = _implementation(conf.loop, "uvloop", "asyncio")
+    http = _implementation(conf.http, "httptools", "h11")
+    port = int(os.environ.get("PORT", cfg.port))
+
+    print(f"Starting {cfg.project_name} ({cfg.environment}) on {conf.host}:{port} "
+          f"workers={workers} loop={loop} http={http} config={config_path}")
+
+    uvicorn.run(
+        "src.bangtori_ai:app",
+        host=conf.host,
+        port=port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        timeout_graceful_shutdown=conf.graceful_timeout,
+        timeout_keep_alive=conf.keep_alive,
+        limit_concurrency=conf.limit_concurrency,
+        access_log=conf.access_log,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -53,8 +53,7 @@ GENERATE_DAILY_REPORT = """
     "첫 번째 분석 문장",
     "두 번째 분석 문장",
     "세 번째 분석 문장"
-  ],
-  "aiDailyScore": 0~100 사이의 정수,
+  ]
 }
 
 - aiDailyReport는 하루 상태를 한 문장으로 요약합니다.
@@ -62,16 +61,15 @@ GENERATE_DAILY_REPORT = """
 - aiAnalysis는 다음과 같이 구성된 3개의 분석 결과입니다:
   - 문제 진단과 해결 방안으로 구성된 40자 이하의 한 문장.
 
-- aiDailyScore는 다음 등급 구간을 따릅니다:
-  - 90~100점: 매우 좋음
-  - 80~89점: 좋음
-  - 70~79점: 적절
-  - 55~69점: 보통
-  - 40~54점: 나쁨
-  - 0~39점: 매우 나쁨
+- 일일 점수(aiDailyScore)는 분석 기준에 따라 이미 계산되어 [DAILY_SCORE] 로 주어집니다.
+  점수를 다시 계산하지 말고, 문장 내용이 주어진 점수/등급과 어긋나지 않게 작성하세요.
 
 # 입력 데이터
 다음은 24시간 동안 수집된 환경 데이터입니다. 이를 기반으로 평가를 진행하세요.
+입력 데이터는 항목별 통계 요약입니다 (min/max/mean/p50/p90/p95, 시간대별 평균·최대(buckets), 분석 기준 구간별 체류 비율(bands)).
+
+[DAILY_SCORE]
+{{ score }}
 
 [INPUT_DATA]
 {{ metrics }}
@@ -88,6 +86,7 @@ GENERATE_MONTHLY_REPORT = """
 
 # 입력 데이터
 다음은 {{ time_range }} 동안 수집된 환경 데이터입니다. 이를 기반으로 평가를 진행하세요.
+입력 데이터는 항목별 통계 요약입니다 (min/max/mean/p50/p90/p95, 일별 평균·최대(buckets), 분석 기준 구간별 체류 비율(bands)).
 
 [INPUT_DATA]
 {{ metrics }}
@@ -124,6 +123,7 @@ GENERATE_TIP_REPORT = """
 
 # 입력 데이터  
 다음은 24시간 동안 수집된 환경 데이터입니다. 이를 기반으로 위 항목 중 3가지를 선택해주세요.
+입력 데이터는 항목별 통계 요약입니다 (min/max/mean/p50/p90/p95, 시간대별 평균·최대(buckets), 분석 기준 구간별 체류 비율(bands)).
 
 [INPUT_DATA]
 {{ metrics }}
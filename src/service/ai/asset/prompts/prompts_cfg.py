@@ -24,4 +24,13 @@ MONTHLY_REPORT_PROMPTS = [
 TIP_REPORT_PROMPTS = [
     bantori_prompts.GENERATE_TIP_REPORT,
     bantori_prompts.JSON_OUTPUT_PROMPT
-]
\ No newline at end of file
+]
+
+# 프롬프트 세트별 치환 변수
+# LLMManager 생성 시 템플릿으로 컴파일하며, 실제 {{ }} 슬롯과 다르면 시작 단계에서 오류
+PROMPT_SETS = {
+    "system": (SYSTEM_PROMPTS, ()),
+    "daily_report": (DAILY_REPORT_PROMPTS, ("metrics", "score")),
+    "monthly_report": (MONTHLY_REPORT_PROMPTS, ("metrics", "time_range")),
+    "tip_report": (TIP_REPORT_PROMPTS, ("metrics",)),
+}
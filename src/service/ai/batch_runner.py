@@ -0,0 +1,109 @@
+# service/ai/batch_runner.py
+#
+# 여러 집 / 기기 리포트 일괄 생성
+# - (대상, 리포트 종류) 작업을 고정 개수 worker 가 나눠 처리 (동시 실행 상한)
+# - 작업 시작은 공용 토큰 버킷으로 속도 제한 (요청이 여러 개여도 전체 합산)
+# - 끝난 순서대로 결과를 내보내므로 느린 대상이 나머지를 막지 않음
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Optional
+
+from common.deadline import deadline_scope
+from common.rate_limiter import AsyncTokenBucket
+from service.ai import report_service
+
+_DONE = object()
+
+
+class BatchRunner:
+    def __init__(
+        self, ctx, concurrency: int = 8, rate_per_sec: float = 5.0, burst: float = 5.0,
+        job_deadline: Optional[float] = None,
+    ):
+        self.ctx = ctx
+        self.concurrency = max(1, concurrency)
+        self.limiter = AsyncTokenBucket(rate_per_sec, burst)
+        self.job_deadline = job_deadline
+
+        self.jobs = 0
+        self.failures = 0
+
+    async def run(
+        self,
+        targets: Iterable[Mapping[str, str]],
+        kinds: Iterable[str],
+        mode: str = "llm",
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        대상 × 종류 작업 결과를 완료 순서대로 yield
+          {"target": {...}, "kind": "daily", "ok": true,  "result": {...}, "elapsed": 0.12}
+          {"target": {...}, "kind": "daily", "ok": false, "error": "..."}
+        호출 측이 중간에 iteration 을 멈추면 (클라이언트 연결 종료 등) 남은 worker 는 취소됨
+        """
+        jobs: asyncio.Queue = asyncio.Queue()
+        for target in targets:
+            for kind in kinds:
+                jobs.put_nowait((dict(target), kind))
+
+        results: asyncio.Queue = asyncio.Queue()
+        n_workers = min(self.concurrency, jobs.qsize())
+        workers = [
+            asyncio.create_task(self._worker(jobs, results, mode), name=f"batch-worker-{i}")
+            for i in range(n_workers)
+        ]
+
+        try:
+            remaining = n_workers
+            while remaining:
+                item = await results.get()
+                if item is _DONE:
+                    remaining -= 1
+                    continue
+                yield item
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _worker(self, jobs: asyncio.Queue, results: asyncio.Queue, mode: str) -> None:
+        try:
+            while True:
+                try:
+                    target, kind = jobs.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await self.limiter.acquire()
+                results.put_nowait(await self._run_one(target, kind, mode))
+        finally:
+            results.put_nowait(_DONE)
+
+    async def _run_one(self, target: Dict[str, str], kind: str, mode: str) -> Dict[str, Any]:
+        builder, _ = report_service.REPORT_KINDS[kind]
+        started = time.perf_counter()
+        self.jobs += 1
+
+        try:
+            # 배치 전체가 아닌 작업 단위로 deadline 적용 (요청 deadline 을 해제한 뒤 다시 설정)
+            with deadline_scope(None), deadline_scope(self.job_deadline):
+                result = await builder(self.ctx, mode=mode, scope=target)
+            return {
+                "target": target,
+                "kind": kind,
+                "ok": True,
+                "result": result,
+                "elapsed": round(time.perf_counter() - started, 3),
+            }
+        except Exception as e:
+            self.failures += 1
+            if self.ctx.log:
+                self.ctx.log.warning(f"[BATCH] {kind} {target} failed: {e}")
+            return {"target": target, "kind": kind, "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "jobs": self.jobs,
+            "failures": self.failures,
+            "concurrency": self.concurrency,
+            "rate_per_sec": self.limiter.rate,
+        }
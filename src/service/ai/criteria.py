@@ -0,0 +1,55 @@
+# service/ai/criteria.py
+#
+# analysis_criteria.json 의 항목별 구간(levels)을 numpy 배열로 컴파일
+# - 시작 시 1회 로드 후 ctx.criteria 로 공유
+# - classify(): 샘플 배열 전체를 한 번에 구간 index 로 분류
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+class MetricBands:
+    def __init__(self, name: str, spec: Dict[str, Any]):
+        self.name = name
+        self.unit: str = spec.get("unit", "")
+        self.levels: List[str] = list(spec["levels"].keys())
+
+        bounds = np.asarray(list(spec["levels"].values()), dtype=np.float64)
+        self.lo = bounds[:, 0]
+        # 정수 경계(0~15, 16~35 ...) 사이의 소수값도 포함되도록 [lo, hi + 1) 로 취급
+        self.hi = bounds[:, 1] + 1.0
+        self.floor = float(self.lo.min())
+
+    def classify(self, values: np.ndarray) -> np.ndarray:
+        """
+        각 샘플을 levels index 로 분류 (levels 순서대로 먼저 맞는 구간 우선)
+        - 전체 하한보다 낮은 값은 하한으로 올려서 판정 (예: co2 350 → very_good)
+        - 어떤 구간에도 속하지 않으면 마지막 구간(very_bad)
+        """
+        v = np.maximum(np.asarray(values, dtype=np.float64), self.floor)[:, None]
+        mask = (v >= self.lo) & (v < self.hi)
+        hit = mask.any(axis=1)
+        return np.where(hit, mask.argmax(axis=1), len(self.levels) - 1)
+
+    def fractions(self, values: np.ndarray) -> Dict[str, float]:
+        """구간별 체류 비율 (0~1)"""
+        n = len(values)
+        if n == 0:
+            return {level: 0.0 for level in self.levels}
+
+        counts = np.bincount(self.classify(values), minlength=len(self.levels))
+        return {level: float(c) / n for level, c in zip(self.levels, counts)}
+
+
+class CompiledCriteria:
+    def __init__(self, raw: Dict[str, Any]):
+        self.metrics: Dict[str, MetricBands] = {
+            name: MetricBands(name, spec) for name, spec in raw.items()
+        }
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.metrics
+
+    def __getitem__(self, name: str) -> MetricBands:
+        return self.metrics[name]
@@ -0,0 +1,188 @@
+# service/ai/json_stream.py
+#
+# LLM 스트리밍 응답에서 JSON 객체를 점진적으로 추출
+# - ```json 펜스 등 앞부분의 잡음은 첫 '{' 가 나올 때까지 무시
+# - 최상위 필드 값이 완성되는 즉시 ("field", key, value) 이벤트
+# - 최상위 필드가 배열이면 원소가 완성될 때마다 ("item", key, index, value) 이벤트
+# 문자열/이스케이프 상태를 추적하며 한 번만 스캔하므로 응답 길이에 선형
+# - extract_json_object: 완성된 응답 텍스트용 (구조 문자 사이는 정규식으로 건너뜀 → 문자 단위 루프 없음)
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+_SKIP = object()
+_FENCE = re.compile(r"```json", re.IGNORECASE)
+_STRUCTURAL = re.compile(r'[{}\[\]"]')
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)     # 여는 따옴표 다음 ~ 닫는 따옴표
+
+
+def _decode(text: str) -> Any:
+    text = text.strip()
+    if not text:
+        return _SKIP    # 후행 쉼표 등 빈 값
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return _SKIP
+
+
+class IncrementalJSONExtractor:
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+
+        self._started = False
+        self._depth = 0
+        self._in_str = False
+        self._esc = False
+
+        # 최상위(depth 1) 필드 상태
+        self._key_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+
+        # 최상위 필드가 배열인 경우 원소 상태
+        self._value_is_array = False
+        self._item_start: Optional[int] = None
+        self._item_index = 0
+
+        self.done = False
+        self.result: Dict[str, Any] = {}
+
+    def feed(self, chunk: str) -> List[Tuple]:
+        events: List[Tuple] = []
+        if self.done or not chunk:
+            return events
+
+        self._buf += chunk
+        buf = self._buf
+        i = self._pos
+        n = len(buf)
+
+        while i < n and not self.done:
+            ch = buf[i]
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                i += 1
+                continue
+
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif ch == "\\":
+                    self._esc = True
+                elif ch == '"':
+                    self._in_str = False
+                    if self._depth == 1 and self._key is None and self._key_start is not None:
+                        self._key = orjson.loads(buf[self._key_start:i + 1])
+                i += 1
+                continue
+
+            if ch == '"':
+                self._in_str = True
+                if self._depth == 1 and self._key is None:
+                    self._key_start = i
+            elif ch == ":":
+                if self._depth == 1 and self._key is not None and self._value_start is None:
+                    self._value_start = i + 1
+            elif ch == "{" or ch == "[":
+                if (ch == "[" and self._depth == 1 and self._value_start is not None
+                        and not buf[self._value_start:i].strip()):
+                    self._value_is_array = True
+                    self._item_start = i + 1
+                    self._item_index = 0
+                self._depth += 1
+            elif ch == "}" or ch == "]":
+                if ch == "]" and self._depth == 2 and self._value_is_array:
+                    self._emit_item(buf[self._item_start:i], events)
+                    self._item_start = None
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit_field(buf, i, events)
+                    self.done = True
+            elif ch == ",":
+                if self._depth == 1:
+                    self._emit_field(buf, i, events)
+                elif self._depth == 2 and self._value_is_array:
+                    self._emit_item(buf[self._item_start:i], events)
+                    self._item_start = i + 1
+
+            i += 1
+
+        self._pos = i
+        return events
+
+    def _emit_item(self, text: str, events: List[Tuple]) -> None:
+        value = _decode(text)
+        if value is _SKIP:
+            return
+        events.append(("item", self._key, self._item_index, value))
+        self._item_index += 1
+
+    def _emit_field(self, buf: str, end: int, events: List[Tuple]) -> None:
+        if self._key is not None and self._value_start is not None:
+            value = _decode(buf[self._value_start:end])
+            if value is not _SKIP:
+                self.result[self._key] = value
+                events.append(("field", self._key, value))
+
+        self._key_start = None
+        self._key = None
+        self._value_start = None
+        self._value_is_array = False
+        self._item_start = None
+
+
+def find_json_object(text: str) -> Optional[str]:
+    """
+    첫 최상위 JSON 객체의 부분 문자열 (```json 펜스가 있으면 펜스 이후의 첫 '{' 부터)
+    - 문자열 안의 괄호 / 이스케이프는 무시하고 괄호 깊이만 추적
+    - 객체가 닫히지 않으면 (잘린 응답) None
+    """
+    fence = _FENCE.search(text)
+    start = text.find("{", fence.end() if fence else 0)
+    if start < 0:
+        return None
+
+    depth = 0
+    pos = start
+    while True:
+        m = _STRUCTURAL.search(text, pos)
+        if m is None:
+            return None
+
+        ch = m.group()
+        if ch == '"':
+            tail = _STRING_TAIL.match(text, m.end())
+            if tail is None:
+                return None
+            pos = tail.end()
+            continue
+
+        depth += 1 if ch in "{[" else -1
+        pos = m.end()
+        if depth == 0:
+            return text[start:pos]
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    응답 텍스트 → dict (객체가 없으면 None)
+    orjson 디코딩에 실패하면 (후행 쉼표 등) 필드 단위로 다시 읽어 디코딩되는 필드만 사용
+    """
+    raw = find_json_object(text)
+    if raw is None:
+        return None
+
+    try:
+        value = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        extractor = IncrementalJSONExtractor()
+        extractor.feed(raw)
+        value = extractor.result if extractor.done else None
+    return value if isinstance(value, dict) else None
@@ -1,66 +1,48 @@
 # api 기본 예제
 # service/api/analyze_api.py
 
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
-from typing import Dict, Iterable, Any
+import time
+from typing import AsyncIterator, Dict, Any, List, Literal, Optional
 
-import httpx
+import orjson
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
 import src.common.common_codes as codes
-from src.service.ai.asset.prompts.prompts_cfg import (SYSTEM_PROMPTS, 
-                                                      DAILY_REPORT_PROMPTS, 
-                                                      MONTHLY_REPORT_PROMPTS, 
-                                                      TIP_REPORT_PROMPTS)
+from common.responses import ORJSONResponse
+from service.ai.asset.prompts.prompts_cfg import (DAILY_REPORT_PROMPTS,
+                                                  MONTHLY_REPORT_PROMPTS,
+                                                  TIP_REPORT_PROMPTS)
+from service.ai.json_stream import IncrementalJSONExtractor
+from service.ai.llm_errors import LLMError, LLMResponseFormatError
+from service.ai import report_service
+from service.ai.report_schema import validate_report
+from service.ai.telemetry_frame import TelemetryFrame
 
 # 라우터 등록은 여기서 하고 실제 로직은 service에서 관리
 # http://localhost:8000/
 
 router = APIRouter(prefix="/api/analyze", tags=["analyze"])
 
+# llm : 문장은 LLM, 점수/카테고리는 로컬 엔진 (기본)
+# fast: LLM 호출 없이 로컬 엔진 결과만 반환
+ReportMode = Literal["llm", "fast"]
+
 # GET /api/analyze/dailyReport
 @router.get("/dailyReport")
-async def daily_report(request: Request):
+async def daily_report(request: Request, mode: ReportMode = "llm"):
     ctx = request.app.state.ctx
-    base_url = getattr(ctx, "host", "https://bangtori-be.onrender.com/api")
-
-    # 오늘 0시~내일 0시 (서울 고정)
-    today = datetime.now(ZoneInfo("Asia/Seoul")).date()
-    start_dt = datetime(today.year, today.month, today.day, tzinfo=ZoneInfo("Asia/Seoul"))
-    end_dt = start_dt + timedelta(days=1)
-
-    start_epoch = int(start_dt.timestamp())
-    end_epoch = int(end_dt.timestamp())
-
-    metrics_url = f"{base_url}/telemetry/range"
-    device_url = f"{base_url}/appliances"
-    m_params = {"from": start_epoch, "toExclusive": end_epoch}
+    _require_scoring_for_fast(ctx, mode)
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            # telemetry
-            m_r = await client.get(metrics_url, params=m_params)
-            m_r.raise_for_status()
-            m_payload = m_r.json()
-            metrics = parse_metrics(m_payload)  
-
-            # # devices
-            # d_r = await client.get(device_url)
-            # d_r.raise_for_status()
-            # d_payload = d_r.json()             
-            # device_status = parse_device_status(d_payload)
-
-            resp_text = await ctx.llm_manager.generate(
-                DAILY_REPORT_PROMPTS,
-                placeholders={
-                    "metrics": metrics,
-                    # "deviceStatus": device_status
-                },
-                temperature=0.7
-            )
-            return ctx.llm_manager.parse_reports(resp_text)
-        
+        if mode == "fast":
+            return ORJSONResponse(await report_service.build_daily_report(ctx, mode="fast"))
+        # 사전 계산된 리포트가 있으면 바로 반환, 없으면 즉시 생성
+        return ORJSONResponse(await report_service.get_report(ctx, "daily"))
+
+    except LLMError as e:
+        raise _llm_http_error(e)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Telemetry backend call failed: {e}")
 
@@ -69,112 +51,215 @@ async def daily_report(request: Request):
 @router.get("/monthlyReport")
 async def monthlyReport(request: Request):
     ctx = request.app.state.ctx
-    mgr = ctx.llm_manager
-    base_url = getattr(ctx, "host", "https://bangtori-be.onrender.com/api")
 
-    # 이번 달 1일 ~ 다음 달 1일 (서울 고정)
-    today = datetime.now(ZoneInfo("Asia/Seoul")).date()
-    start_dt = datetime(today.year, today.month, 1, tzinfo=ZoneInfo("Asia/Seoul"))
+    try:
+        return ORJSONResponse(await report_service.get_report(ctx, "monthly"))
 
-    if today.month == 12:  # 12월이면 다음 해 1월
-        end_dt = datetime(today.year + 1, 1, 1, tzinfo=ZoneInfo("Asia/Seoul"))
-    else:
-        end_dt = datetime(today.year, today.month + 1, 1, tzinfo=ZoneInfo("Asia/Seoul"))
+    except LLMError as e:
+        raise _llm_http_error(e)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Monthly telemetry backend call failed: {e}")
 
-    start_epoch = int(start_dt.timestamp())
-    end_epoch = int(end_dt.timestamp())
 
-    metrics_url = f"{base_url}/telemetry/range"
-    m_params = {"from": start_epoch, "toExclusive": end_epoch}
+# GET /api/analyze/category
+@router.get("/category")
+async def tip_category(request: Request, mode: ReportMode = "llm"):
+    ctx = request.app.state.ctx
+    _require_scoring_for_fast(ctx, mode)
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            # 1달치 telemetry 데이터 조회
-            m_r = await client.get(metrics_url, params=m_params)
-            m_r.raise_for_status()
-            m_payload = m_r.json()
-            metrics = parse_metrics(m_payload)
-
-        # LLM 프롬프트 생성
-        resp_text = await mgr.generate(
-            MONTHLY_REPORT_PROMPTS,
-            placeholders={
-                "metrics": metrics,
-                "time_range": {
-                    "start": start_dt.strftime("%Y-%m-%d"),
-                    "end": (end_dt - timedelta(days=1)).strftime("%Y-%m-%d")
-                }
-            },
-            temperature=0.7
-        )
-
-        return mgr.parse_reports(resp_text)
+        if mode == "fast":
+            return ORJSONResponse(await report_service.build_tip_report(ctx, mode="fast"))
+        return ORJSONResponse(await report_service.get_report(ctx, "tip"))
 
+    except LLMError as e:
+        raise _llm_http_error(e)
     except Exception as e:
-        raise HTTPException(status_code=502, detail=f"Monthly telemetry backend call failed: {e}")
+        raise HTTPException(status_code=502, detail=f"Telemetry backend call failed: {e}")
 
 
-# GET /api/analyze/category
-@router.get("/category")
-async def tip_category(request: Request):
+# ------------------------
+# 여러 집 / 기기 일괄 리포트 (NDJSON 스트림)
+#   한 줄에 작업 하나: {"target": {...}, "kind": ..., "ok": ..., "result" | "error": ...}
+#   마지막 줄        : {"done": true, "total": n, "failed": m, "elapsed": sec}
+# ------------------------
+class BatchTarget(BaseModel):
+    homeId: Optional[str] = None
+    deviceId: Optional[str] = None
+
+    def scope(self) -> Dict[str, str]:
+        return {k: v for k, v in (("homeId", self.homeId), ("deviceId", self.deviceId)) if v}
+
+
+class BatchReportRequest(BaseModel):
+    targets: List[BatchTarget] = Field(..., min_length=1)
+    kinds: List[Literal["daily", "monthly", "tip"]] = ["daily"]
+    mode: ReportMode = "llm"
+
+
+# POST /api/analyze/batch
+@router.post("/batch")
+async def batch_report(request: Request, body: BatchReportRequest):
     ctx = request.app.state.ctx
-    base_url = getattr(ctx, "host", "https://bangtori-be.onrender.com/api")
+    runner = getattr(ctx, "batch_runner", None)
+    if runner is None:
+        raise HTTPException(status_code=503, detail="Batch reports are disabled")
+    _require_scoring_for_fast(ctx, body.mode)
+    if body.mode == "fast" and "monthly" in body.kinds:
+        # 월간 리포트는 로컬 점수 엔진 버전이 없음 (LLM 호출 없는 fast 모드로 요청할 수 없음)
+        raise HTTPException(status_code=422, detail="Monthly reports have no fast mode; use mode=llm")
+
+    scopes = [t.scope() for t in body.targets]
+    if any(not s for s in scopes):
+        raise HTTPException(status_code=422, detail="Each target needs homeId or deviceId")
+
+    max_targets = getattr(getattr(ctx.cfg, "batch", None), "max_targets", 200)
+    if len(scopes) > max_targets:
+        raise HTTPException(status_code=413, detail=f"Too many targets (max {max_targets})")
+
+    kinds = list(dict.fromkeys(body.kinds))
+    return StreamingResponse(
+        _stream_batch_lines(runner, scopes, kinds, body.mode),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _stream_batch_lines(runner, scopes: List[Dict[str, str]], kinds: List[str], mode: str) -> AsyncIterator[bytes]:
+    started = time.perf_counter()
+    total = failed = 0
+
+    async for item in runner.run(scopes, kinds, mode):
+        total += 1
+        failed += 0 if item["ok"] else 1
+        yield orjson.dumps(item) + b"\n"
+
+    yield orjson.dumps({
+        "done": True,
+        "total": total,
+        "failed": failed,
+        "elapsed": round(time.perf_counter() - started, 3),
+    }) + b"\n"
+
+
+def _llm_http_error(e: LLMError) -> HTTPException:
+    """LLMError → 상태 코드 (503 과부하 / circuit open, 504 timeout, 502 provider 오류)"""
+    headers = None
+    if e.retry_after is not None:
+        headers = {"Retry-After": str(max(1, int(e.retry_after + 0.999)))}
+    return HTTPException(status_code=e.status_code, detail=f"LLM call failed ({type(e).__name__}): {e}", headers=headers)
+
+
+def _require_scoring_for_fast(ctx, mode: str) -> None:
+    if mode == "fast" and getattr(ctx, "scoring_engine", None) is None:
+        raise HTTPException(status_code=503, detail="Local scoring engine is not available")
+
+
+# ------------------------
+# 스트리밍 (Server-Sent Events)
+#   event: field → {"key": ..., "value": ...}          최상위 필드 완성 시
+#   event: item  → {"key": ..., "index": n, "value": ...} 배열 원소 완성 시
+#   event: done  → parse_reports 와 같은 형태의 최종 결과 (리포트 스키마 검증 후)
+#   event: error → {"detail": ...}   (LLM 호출 실패 / 응답 스키마 위반)
+# ------------------------
+
+# GET /api/analyze/dailyReport/stream
+@router.get("/dailyReport/stream")
+async def daily_report_stream(request: Request):
+    ctx = request.app.state.ctx
+    start_dt, end_dt = report_service.today_window()
 
-    # 오늘 0시~내일 0시 (서울 고정)
-    today = datetime.now(ZoneInfo("Asia/Seoul")).date()
-    start_dt = datetime(today.year, today.month, today.day, tzinfo=ZoneInfo("Asia/Seoul"))
-    end_dt = start_dt + timedelta(days=1)
+    series = await _load_series_or_502(ctx, start_dt, end_dt)
+    placeholders = report_service.daily_placeholders(ctx, series, report_service.evaluate_series(ctx, series))
 
-    start_epoch = int(start_dt.timestamp())
-    end_epoch = int(end_dt.timestamp())
+    # 로컬 점수는 LLM 응답을 기다리지 않고 첫 이벤트로 전송
+    return _sse_response(
+        ctx,
+        "daily",
+        DAILY_REPORT_PROMPTS,
+        placeholders,
+        preset={"aiDailyScore": placeholders["score"]["aiDailyScore"]},
+    )
 
-    metrics_url = f"{base_url}/telemetry/range"
-    m_params = {"from": start_epoch, "toExclusive": end_epoch}
+
+# GET /api/analyze/monthlyReport/stream
+@router.get("/monthlyReport/stream")
+async def monthly_report_stream(request: Request):
+    ctx = request.app.state.ctx
+    start_dt, end_dt = report_service.month_window()
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            # telemetry
-            m_r = await client.get(metrics_url, params=m_params)
-            m_r.raise_for_status()
-            m_payload = m_r.json()
-            metrics = parse_metrics(m_payload)  
-
-            resp_text = await ctx.llm_manager.generate(
-                TIP_REPORT_PROMPTS,
-                placeholders={
-                    "metrics": metrics,
-                },
-                temperature=0.7
-            )
-            return ctx.llm_manager.parse_reports(resp_text)
-        
+        metrics = await report_service.monthly_metrics(ctx, start_dt, end_dt)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Monthly telemetry backend call failed: {e}")
+    return _sse_response(
+        ctx, "monthly", MONTHLY_REPORT_PROMPTS, report_service.monthly_placeholders(ctx, metrics, start_dt, end_dt)
+    )
+
+
+# GET /api/analyze/category/stream
+@router.get("/category/stream")
+async def tip_category_stream(request: Request):
+    ctx = request.app.state.ctx
+    start_dt, end_dt = report_service.today_window()
+
+    series = await _load_series_or_502(ctx, start_dt, end_dt)
+    return _sse_response(ctx, "tip", TIP_REPORT_PROMPTS, report_service.tip_placeholders(ctx, series))
+
+
+async def _load_series_or_502(ctx, start_dt, end_dt) -> TelemetryFrame:
+    # 스트림을 열기 전에 실패해야 정상적인 HTTP 상태 코드로 응답할 수 있음
+    try:
+        return await report_service.load_series(ctx, start_dt, end_dt)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Telemetry backend call failed: {e}")
 
 
-def parse_metrics(payload: dict) -> dict:
-    metrics = {
-        "dust":  [point["value"] for point in payload.get("series", {}).get("dust", [])],
-        "co2":   [point["value"] for point in payload.get("series", {}).get("co2", [])],
-        "tvoc":  [point["value"] for point in payload.get("series", {}).get("tvoc", [])],
-        "temp":  [point["value"] for point in payload.get("series", {}).get("temp", [])],
-        "humi":  [point["value"] for point in payload.get("series", {}).get("humi", [])],
-    }
-
-    return metrics
-
-def parse_device_status(items: Iterable[dict]) -> Dict[str, bool]:
-    summary: Dict[str, bool] = {}
-    for it in items or []:
-        try:
-            dev_type = str(it.get("type", "")).strip()
-            if not dev_type:
-                continue
-            key = dev_type.upper()
-            on = bool(it.get("on", False))
-            # 하나라도 True면 True
-            summary[key] = summary.get(key, False) or on
-        except Exception:
-            # 단일 항목 오류는 무시하고 계속
-            continue
-    return summary
\ No newline at end of file
+def _sse_response(
+    ctx, kind: str, prompts: List[str], placeholders: Dict[str, Any], preset: Optional[Dict[str, Any]] = None
+) -> StreamingResponse:
+    return StreamingResponse(
+        _stream_report_events(ctx, kind, prompts, placeholders, preset or {}),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _stream_report_events(
+    ctx, kind: str, prompts: List[str], placeholders: Dict[str, Any], preset: Dict[str, Any]
+) -> AsyncIterator[bytes]:
+    mgr = ctx.llm_manager
+    extractor = IncrementalJSONExtractor()
+    parts: List[str] = []
+
+    for key, value in preset.items():
+        yield _sse("field", {"key": key, "value": value})
+
+    try:
+        async for chunk in mgr.generate_stream(prompts, placeholders=placeholders, temperature=report_service.LLM_TEMPERATURE):
+            parts.append(chunk)
+            for ev in extractor.feed(chunk):
+                if ev[0] == "item":
+                    yield _sse("item", {"key": ev[1], "index": ev[2], "value": ev[3]})
+                else:
+                    yield _sse("field", {"key": ev[1], "value": ev[2]})
+    except Exception as e:
+        yield _sse("error", {"detail": f"LLM stream failed ({type(e).__name__}): {e}"})
+        return
+
+    try:
+        if extractor.done:
+            result = {"time": int(time.time()), "reports": validate_report(kind, extractor.result)}
+        else:
+            # 스트림 중 JSON 이 닫히지 않은 경우 전체 텍스트로 한 번 더 시도
+            result = mgr.parse_reports("".join(parts), kind)
+    except LLMResponseFormatError as e:
+        yield _sse("error", {"detail": f"LLM response rejected ({type(e).__name__}): {e}"})
+        return
+
+    result["reports"].update(preset)
+    yield _sse("done", result)
+
+
+def _sse(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
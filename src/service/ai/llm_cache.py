@@ -0,0 +1,90 @@
+# service/ai/llm_cache.py
+#
+# LLM 응답 캐시
+# - 키: sha256(model + GenerationConfig 옵션 + 최종 프롬프트)
+# - 1차: 메모리 TTLCache (응답 바이트 합계로 크기 제한)
+# - 2차: (선택) SQLite 파일 → 재시작 후에도 유지, 같은 파일을 쓰는 워커끼리 공유
+
+import asyncio
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+import orjson
+from cachetools import TTLCache
+
+from common.sqlite_store import SQLiteTTLStore
+
+
+def _text_size(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+class LLMResponseCache:
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl: float = 3600.0,
+        disk_path: Optional[str] = None,
+        disk_ttl: float = 86400.0,
+    ):
+        self._memory = TTLCache(maxsize=max_bytes, ttl=ttl, getsizeof=_text_size)
+        self._disk = SQLiteTTLStore(disk_path, "llm_cache") if disk_path else None
+        self.disk_ttl = disk_ttl
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(prompt: str, model: str, options: Dict[str, Any]) -> str:
+        head = orjson.dumps({"model": model, "options": options}, option=orjson.OPT_SORT_KEYS)
+        h = hashlib.sha256(head)
+        h.update(b"\0")
+        h.update(prompt.encode("utf-8"))
+        return h.hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self._memory.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        if self._disk is not None:
+            value = await asyncio.to_thread(self._disk.get, key)
+            if value is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                self._put_memory(key, value)
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        self._put_memory(key, value)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.set, key, value, time.time() + self.disk_ttl)
+
+    def _put_memory(self, key: str, value: str) -> None:
+        try:
+            self._memory[key] = value
+        except ValueError:
+            # 단일 응답이 메모리 상한보다 큰 경우 → 메모리에는 두지 않음
+            pass
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "bytes": self._memory.currsize,
+            "max_bytes": self._memory.maxsize,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
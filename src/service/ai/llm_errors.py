@@ -0,0 +1,106 @@
+# service/ai/llm_errors.py
+#
+# LLM provider 호출 오류 타입
+# - retryable   : 재시도 / circuit breaker 실패 집계 대상 여부
+# - status_code : API 응답으로 변환할 때 사용할 HTTP 상태 코드
+# - LLMResponse*Error : 호출은 성공했지만 응답을 리포트로 쓸 수 없는 경우 (재시도 대상 아님)
+
+import asyncio
+from typing import Optional
+
+
+class LLMError(Exception):
+    retryable = False
+    status_code = 502
+
+    def __init__(self, message: str, *, provider: Optional[str] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class LLMRateLimitError(LLMError):
+    """429 / quota 초과"""
+    retryable = True
+    status_code = 503
+
+
+class LLMTimeoutError(LLMError):
+    """단일 호출 timeout"""
+    retryable = True
+    status_code = 504
+
+
+class LLMUnavailableError(LLMError):
+    """5xx / 연결 실패 등 일시적 provider 장애"""
+    retryable = True
+    status_code = 502
+
+
+class LLMBadRequestError(LLMError):
+    """잘못된 요청 / 인증 실패 / 안전 필터 차단 등 재시도해도 같은 결과인 오류"""
+
+
+class LLMCircuitOpenError(LLMError):
+    """circuit breaker 가 열려 호출 없이 즉시 실패"""
+    status_code = 503
+
+
+class LLMDeadlineExceeded(LLMError):
+    """요청 deadline 안에 응답을 받을 수 없음"""
+    status_code = 504
+
+
+class LLMResponseFormatError(LLMError):
+    """응답에서 JSON 객체를 찾거나 디코딩할 수 없음 (잘린 응답 / 형식 무시)"""
+
+
+class LLMResponseSchemaError(LLMResponseFormatError):
+    """JSON 은 있으나 리포트 스키마 위반 (필수 필드 누락 / 타입 불일치)"""
+
+    def __init__(self, message: str, *, errors: Optional[list] = None, **kwargs):
+        super().__init__(message, **kwargs)
+        self.errors = errors or []
+
+
+_RETRYABLE_STATUS = {408, 500, 502, 503, 504}
+
+
+def _status_of(e: Exception) -> Optional[int]:
+    # httpx.HTTPStatusError
+    response = getattr(e, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is None:
+        # google.api_core.exceptions.GoogleAPICallError (code: HTTPStatus | int)
+        status = getattr(e, "code", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(e: Exception, provider: Optional[str] = None) -> LLMError:
+    """provider SDK / HTTP 예외를 LLMError 하위 타입으로 변환"""
+    if isinstance(e, LLMError):
+        return e
+
+    message = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+    if isinstance(e, asyncio.TimeoutError):
+        return LLMTimeoutError(message, provider=provider)
+
+    status = _status_of(e)
+    if status == 429 or type(e).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return LLMRateLimitError(message, provider=provider)
+    if status in _RETRYABLE_STATUS:
+        return LLMUnavailableError(message, provider=provider)
+    if status is not None and 400 <= status < 500:
+        return LLMBadRequestError(message, provider=provider)
+
+    # 상태 코드가 없는 전송 계층 오류 (httpx.TransportError, ConnectionError 등)
+    if isinstance(e, (ConnectionError, OSError)) or "Transport" in type(e).__name__ or "Connect" in type(e).__name__:
+        return LLMUnavailableError(message, provider=provider)
+
+    # genai 는 차단된 응답의 .text 접근 시 ValueError 발생
+    if isinstance(e, ValueError):
+        return LLMBadRequestError(message, provider=provider)
+    return LLMUnavailableError(message, provider=provider)
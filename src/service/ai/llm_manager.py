@@ -1,29 +1,87 @@
-import json
-import re
+import copy
 import time
-import os  # 추가
-import google.generativeai as genai  # Gemini 라이브러리 추가
-from asyncio import to_thread
-from typing import Any, Dict, List, Optional, Union
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
-_PLACEHOLDER_RE = re.compile(r"\{\{\s*([A-Za-z0-9_]+)\s*\}\}")
+from common.metrics import span
+from common.single_flight import SingleFlight
+from service.ai.llm_cache import LLMResponseCache
+from service.ai.llm_errors import LLMDeadlineExceeded, LLMError, LLMResponseFormatError
+from service.ai.llm_resilience import ProviderGuard
+from service.ai.llm_router import DEFAULT_ROUTE, LLMRouter
+from service.ai.asset.prompts.prompts_cfg import PROMPT_SETS
+from service.ai.prompt_template import PromptRegistry, PromptTemplate
+from service.ai.providers import LLMProvider, create_provider, estimate_tokens
+from service.ai.report_schema import PROMPT_SET_KINDS, parse_report
+
+PARSED_MEMO_SIZE = 64       # 최근 검증한 응답 수 (캐시 저장 전 검증 결과를 parse_reports 에서 재사용)
 
 class LLMManager:
-    def __init__(self, ctx, provider: str, model: str):
+    def __init__(
+        self,
+        ctx,
+        provider: str,
+        model: str,
+        cache: Optional[LLMResponseCache] = None,
+        max_concurrency: int = 64,
+        split_system_prefix: bool = True,
+        resilience: Optional[Dict[str, Any]] = None,
+        router: Optional[LLMRouter] = None,
+    ):
         self.ctx = ctx
         self.provider = provider
         self.model = model
+        self.cache = cache
+        self._flight = SingleFlight()   # 동일 프롬프트 동시 호출 합치기
+
+        # 프롬프트 세트는 시작 시 1회 컴파일 (슬롯 선언 불일치 시 여기서 실패)
+        self.prompts = PromptRegistry()
+        self.prompts.register_all(PROMPT_SETS)
+
+        # 정적 prefix(INITIAL_PROMPT, ANALYSIS_CRITERIA 등)를 system instruction 으로 분리
+        self.split_system_prefix = split_system_prefix
+        self.token_stats: Dict[str, dict] = {}
+        # (리포트 종류, 응답 텍스트) → 검증된 리포트 (같은 응답을 두 번 파싱하지 않도록)
+        self._parsed: Dict[Tuple[Optional[str], str], dict] = {}
+
+        # provider 동시 호출 상한 (쓰레드 풀 대신 세마포어로 제한)
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.inflight = 0               # 현재 provider 호출 중인 수
+        self.waiting = 0                # 세마포어 대기 중인 수
+
+        # 프롬프트 세트별 route 선택 / failover
+        # router 가 없으면 provider + model 하나로 구성 (속도 제한 / 재시도 / circuit breaker 포함)
+        if router is None:
+            guard = ProviderGuard(create_provider(self.provider, self.model), **(resilience or {}))
+            router = LLMRouter({DEFAULT_ROUTE: guard})
+        self.router = router
+
+        # 기본 route (단일 provider 구성과의 호환용)
+        self.guard: ProviderGuard = router.routes[router.default]
+        self.client: LLMProvider = self.guard.provider
 
-        if self.provider == "gemini":
-            # 보안을 위해 환경 변수에서 API 키를 가져옵니다.
-            api_key = os.environ.get("GEMINI_API_KEY")
-            if not api_key:
-                raise ValueError("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
-            
-            genai.configure(api_key=api_key)
-            self.gemini_model = genai.GenerativeModel(self.model)
-        else:
-            raise ValueError(f"Unsupported provider: {provider}. Supported provider is 'gemini'.")
+        # provider 준비 (SDK import 등) 는 백그라운드 warmup 또는 첫 호출 시 1회
+        self._warmup_task: Optional[asyncio.Task] = None
+        self.warmup_errors: Dict[str, Optional[str]] = {}
+
+    async def warmup(self) -> Dict[str, Optional[str]]:
+        """모든 route provider 준비, 동시에 여러 번 불려도 실제 작업은 1회"""
+        if self._warmup_task is None:
+            self._warmup_task = asyncio.ensure_future(self.router.warmup())
+        # 먼저 기다리던 쪽이 취소되어도 준비 작업은 계속되도록 shield
+        self.warmup_errors = await asyncio.shield(self._warmup_task)
+        return self.warmup_errors
+
+    async def aclose(self) -> None:
+        """provider 가 직접 만든 HTTP 클라이언트 등 정리 (AppContext 공용 클라이언트는 그대로)"""
+        await self.router.aclose()
+
+    @property
+    def warmed_up(self) -> bool:
+        task = self._warmup_task
+        return task is not None and task.done() and not task.cancelled()
 
     async def generate(
         self,
@@ -32,32 +90,155 @@ class LLMManager:
         placeholders: Optional[Dict[str, Any]] = None,
         **options
     ) -> str:
-        final_prompt = self._compose_prompt(prompt, placeholders=placeholders)
+        template, system, user = self._compose_split(prompt, placeholders=placeholders)
+
+        # 동일 프롬프트 + 모델 + 옵션이면 캐시된 응답 재사용
+        cache_key = self._cache_key(template, system, user, options)
+        if self.cache is not None:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # 같은 키로 이미 진행 중인 호출이 있으면 그 결과를 함께 기다림
+        return await self._flight.do(
+            cache_key, lambda: self._generate_and_store(cache_key, template, system, user, options),
+            on_deadline=lambda: LLMDeadlineExceeded(f"deadline exceeded waiting for '{template.name}' response"),
+        )
+
+    async def generate_stream(
+        self,
+        prompt: Union[str, List[str]],
+        *,
+        placeholders: Optional[Dict[str, Any]] = None,
+        **options
+    ) -> AsyncIterator[str]:
+        """
+        응답 텍스트를 도착하는 대로 조각(chunk) 단위로 yield
+        캐시에 있으면 전체 응답을 한 번에 yield 하고, 스트림이 끝나면 결과를 캐시에 저장
+        """
+        template, system, user = self._compose_split(prompt, placeholders=placeholders)
+
+        cache_key = self._cache_key(template, system, user, options)
+        if self.cache is not None:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        parts: List[str] = []
+        if not self.warmed_up:
+            await self.warmup()
+        async with self._provider_slot():
+            async for text in self.router.stream(template.name, user, system=system, **options):
+                parts.append(text)
+                yield text
+            # 스트림은 provider 보고값이 없으므로 출력 토큰은 추정치
+            self._record_tokens(template, system, user, output_tokens=estimate_tokens("".join(parts)))
+
+        if self.cache is not None and parts:
+            text = "".join(parts)
+            if self._cacheable(template, text):
+                await self.cache.set(cache_key, text)
+
+    async def _generate_and_store(
+        self, cache_key: str, template: PromptTemplate, system: Optional[str], user: str, options: Dict[str, Any]
+    ) -> str:
+        text = await self._call_provider(template, system, user, **options)
 
-        if self.provider == "gemini":
-            # Gemini API 옵션을 GenerationConfig로 변환합니다.
-            # options 딕셔너리에 있는 키와 값을 기반으로 설정합니다.
-            generation_config = genai.types.GenerationConfig(**options)
+        # 빈 응답 / 리포트로 쓸 수 없는 응답은 캐시하지 않음 (재요청 시 다시 생성)
+        if self.cache is not None and text and self._cacheable(template, text):
+            await self.cache.set(cache_key, text)
 
-            def _call_gemini():
-                # 동기 함수인 generate_content를 비동기 컨텍스트에서 실행합니다.
-                return self.gemini_model.generate_content(
-                    final_prompt,
-                    generation_config=generation_config
-                )
+        return text
 
+    @asynccontextmanager
+    async def _provider_slot(self):
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.inflight += 1
+        try:
+            yield
+        finally:
+            self.inflight -= 1
+            self._semaphore.release()
+
+    async def _call_provider(self, template: PromptTemplate, system: Optional[str], user: str, **options) -> str:
+        """실패 시 LLMError 하위 타입을 그대로 전파 (빈 응답으로 숨기지 않음)"""
+        if not self.warmed_up:
+            await self.warmup()
+        async with self._provider_slot():
             try:
-                response = await to_thread(_call_gemini)
-                return response.text
-            except Exception as e:
-                print(f"Gemini API 호출 중 오류 발생: {e}")
-                # 필요한 경우 response.prompt_feedback 등을 통해 추가 정보 확인 가능
-                return ""
-        
-        return "" # __init__에서 provider를 검증하므로 실행될 일 없음
+                with span(self.ctx, "llm_provider"):
+                    completion, _ = await self.router.generate(template.name, user, system=system, **options)
+            except LLMError as e:
+                if self.ctx.log:
+                    self.ctx.log.warning(f"[LLM] {type(e).__name__} ({e.provider or self.provider}): {e}")
+                raise
+
+            self._record_tokens(
+                template, system, user,
+                prompt_tokens=completion.prompt_tokens,
+                output_tokens=completion.output_tokens if completion.output_tokens is not None
+                else estimate_tokens(completion.text),
+            )
+            return completion.text
+
+    def _record_tokens(
+        self,
+        template: PromptTemplate,
+        system: Optional[str],
+        user: str,
+        prompt_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None,
+    ) -> None:
+        """프롬프트 세트별 정적 prefix / 동적 suffix 토큰 분포 (추정치 + provider 보고값)"""
+        stats = self.token_stats.get(template.name)
+        if stats is None:
+            stats = self.token_stats[template.name] = {
+                "calls": 0,
+                "prefix_tokens": estimate_tokens(template.prefix),
+                "prefix_as_system": bool(system),
+                "suffix_tokens_total": 0,
+                "reported_prompt_tokens_total": 0,
+                "output_tokens_total": 0,
+            }
+        stats["calls"] += 1
+        stats["suffix_tokens_total"] += estimate_tokens(user)
+        if prompt_tokens:
+            stats["reported_prompt_tokens_total"] += prompt_tokens
+        if output_tokens:
+            stats["output_tokens_total"] += output_tokens
+
+    def _cacheable(self, template: PromptTemplate, text: str) -> bool:
+        kind = PROMPT_SET_KINDS.get(template.name)
+        if kind is None:
+            return True
+        try:
+            self._parse(text, kind)
+            return True
+        except LLMResponseFormatError as e:
+            if self.ctx.log:
+                self.ctx.log.warning(f"[LLM] response for '{template.name}' not cached: {e}")
+            return False
+
+    def _cache_key(self, template: PromptTemplate, system: Optional[str], user: str, options: Dict[str, Any]) -> str:
+        prompt = f"{system}\0{user}" if system else user
+        return LLMResponseCache.make_key(prompt, self.router.policy_key(template.name), options)
+
+    def concurrency_stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "inflight": self.inflight,
+            "waiting": self.waiting,
+            "router": self.router.stats(),
+        }
 
     # ------------------------
-    # 내부: 프롬프트 합성 + 치환 (변경 없음)
+    # 내부: 프롬프트 합성 + 치환 (컴파일된 템플릿 사용)
     # ------------------------
     def _compose_prompt(
         self,
@@ -65,53 +246,46 @@ class LLMManager:
         *,
         placeholders: Optional[Dict[str, Any]] = None,
     ) -> str:
-        if isinstance(prompt, list):
-            rendered = [self._render_placeholders(str(p), placeholders) for p in prompt if p]
-            return "\n\n".join(rendered)
-        return self._render_placeholders(str(prompt), placeholders)
-
-    def _render_placeholders(self, text: str, placeholders: Optional[Dict[str, Any]]) -> str:
-        if not placeholders:
-            return text
-
-        def _to_str(val: Any) -> str:
-            if val is None:
-                return ""
-            if isinstance(val, (dict, list)):
-                return json.dumps(val, ensure_ascii=False, indent=2)
-            if isinstance(val, (str, int, float, bool)):
-                return str(val)
-            return repr(val)
-
-        def repl(m: re.Match) -> str:
-            key = m.group(1)
-            if key in placeholders:
-                return _to_str(placeholders[key])
-            return m.group(0)
-
-        return _PLACEHOLDER_RE.sub(repl, text)
-    
-
-    
-    def parse_reports(self, raw_text: str) -> dict:
-        """
-        Gemini 응답에서 첫 번째 JSON 블록만 뽑아 time과 함께 반환
-        """
-        # ```json ... ``` 안쪽 내용 먼저 찾기
-        match = re.search(r"```json\s*(.*?)```", raw_text, re.DOTALL | re.IGNORECASE)
-        if match:
-            raw_json = match.group(1).strip()
-        else:
-            # 없으면 그냥 { } 블록 찾아보기
-            match = re.search(r"\{.*\}", raw_text, re.DOTALL)
-            raw_json = match.group(0).strip() if match else "{}"
+        return self.prompts.lookup(prompt).render(placeholders)
 
-        try:
-            reports = json.loads(raw_json)
-        except Exception:
-            reports = {}
+    def _compose_split(
+        self,
+        prompt: Union[str, List[str]],
+        *,
+        placeholders: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[PromptTemplate, Optional[str], str]:
+        """(템플릿, system instruction 으로 보낼 정적 prefix | None, 매 요청 전송할 suffix)"""
+        template = self.prompts.lookup(prompt)
+        if not self.split_system_prefix or not template.prefix:
+            return template, None, template.render(placeholders)
 
+        prefix, suffix = template.render_split(placeholders)
+        if not suffix:
+            # 전부 정적인 세트는 그대로 본문으로 전송
+            return template, None, prefix
+        return template, prefix, suffix
+
+    def parse_reports(self, raw_text: str, kind: Optional[str] = None) -> dict:
+        """
+        응답에서 첫 번째 JSON 객체를 뽑아 리포트 종류(kind) 스키마로 검증 후 time 과 함께 반환
+        JSON 이 없거나 스키마 위반이면 LLMResponseFormatError / LLMResponseSchemaError
+        """
         return {
             "time": int(time.time()),
-            "reports": reports
-        }
\ No newline at end of file
+            "reports": self._parse(raw_text, kind)
+        }
+
+    def _parse(self, text: str, kind: Optional[str]) -> dict:
+        """
+        parse_report 결과를 최근 PARSED_MEMO_SIZE 개까지 기억
+        - 새로 생성한 응답은 캐시 저장 전 (_cacheable) 에 검증되므로 parse_reports 에서는 다시 파싱하지 않음
+        - 호출 측이 리포트를 수정하므로 (점수 / preset 덮어쓰기) 중첩 목록까지 복사해 반환
+        """
+        key = (kind, text)
+        reports = self._parsed.pop(key, None)
+        if reports is None:
+            reports = parse_report(text, kind)
+            if len(self._parsed) >= PARSED_MEMO_SIZE:
+                del self._parsed[next(iter(self._parsed))]
+        self._parsed[key] = reports     # 가장 최근 사용으로
+        return copy.deepcopy(reports)
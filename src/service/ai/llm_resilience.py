@@ -0,0 +1,233 @@
+# service/ai/llm_resilience.py
+#
+# provider 호출 보호 계층
+# - 모델별 토큰 버킷으로 호출 속도 제한
+# - tenacity 로 지수 backoff + jitter 재시도 (재시도 가능한 오류만)
+# - 요청 deadline 을 넘기지 않도록 호출 timeout / 재시도 대기 시간 제한
+# - 연속 실패 시 circuit breaker 가 열려 provider 호출 없이 즉시 실패
+
+import asyncio
+import time
+from typing import AsyncIterator, Optional, Tuple
+
+from tenacity import (AsyncRetrying, RetryCallState, retry_if_exception,
+                      stop_after_attempt, wait_random_exponential)
+
+from common import deadline
+from common.rate_limiter import AsyncTokenBucket
+from service.ai.llm_errors import (LLMCircuitOpenError, LLMDeadlineExceeded,
+                                   LLMError, classify_error)
+from service.ai.providers import Completion, LLMProvider
+
+
+class CircuitBreaker:
+    """
+    closed    : 정상 호출, 연속 실패 수 집계
+    open      : reset_timeout 동안 즉시 실패
+    half_open : reset_timeout 경과 후 시험 호출 1건만 허용 → 성공 시 closed, 실패 시 다시 open
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def before_call(self, name: Optional[str] = None) -> None:
+        if self.state == "closed":
+            return
+
+        if self.state == "open":
+            wait = self.opened_at + self.reset_timeout - time.monotonic()
+            if wait > 0:
+                raise LLMCircuitOpenError(f"circuit open for {name}", provider=name, retry_after=wait)
+            self.state = "half_open"
+
+        if self._probing:
+            raise LLMCircuitOpenError(f"circuit half-open for {name}", provider=name, retry_after=1.0)
+        self._probing = True
+
+    def available(self) -> bool:
+        """상태를 바꾸지 않고 지금 호출이 허용되는지 확인 (라우팅 판단용)"""
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() < self.opened_at + self.reset_timeout:
+            return False
+        return not self._probing
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def release(self) -> None:
+        """provider 장애와 무관한 실패 (잘못된 요청 등) → 상태 변화 없이 시험 호출 슬롯만 반납"""
+        self._probing = False
+
+
+class ProviderGuard:
+    """LLMProvider 하나(= 모델 하나)에 대한 속도 제한 / 재시도 / deadline / circuit breaker"""
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        *,
+        rate_per_sec: float = 10.0,
+        burst: float = 10.0,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        attempt_timeout: float = 30.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.provider = provider
+        self.limiter = AsyncTokenBucket(rate_per_sec, burst)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.attempt_timeout = attempt_timeout
+        self.breaker = breaker or CircuitBreaker()
+
+        self.retries = 0
+        self.errors = 0
+
+    @property
+    def name(self) -> str:
+        return f"{self.provider.name}:{self.provider.model}"
+
+    async def generate(self, prompt: str, *, system: Optional[str] = None, **options) -> Completion:
+        async for attempt in self._retrying():
+            with attempt:
+                timeout = await self._begin_attempt()
+                try:
+                    completion = await asyncio.wait_for(
+                        self.provider.generate(prompt, system=system, **options), timeout
+                    )
+                except asyncio.CancelledError:
+                    self.breaker.release()
+                    raise
+                except Exception as e:
+                    raise self._failed(e) from e
+                self.breaker.record_success()
+                return completion
+
+    async def stream(self, prompt: str, *, system: Optional[str] = None, **options) -> AsyncIterator[str]:
+        """
+        첫 조각을 받기 전까지만 재시도 (이미 내보낸 조각은 되돌릴 수 없으므로)
+        이후 조각 사이 간격도 attempt_timeout / deadline 으로 제한
+        """
+        agen, first = None, None
+        async for attempt in self._retrying():
+            with attempt:
+                agen, first = await self._open_stream(prompt, system, options)
+
+        settled = False     # breaker 에 성공 / 실패를 기록했는지
+        try:
+            if first is not None:
+                yield first
+            while True:
+                # deadline 초과면 __anext__() 코루틴을 만들기 전에 실패
+                budget = self._attempt_budget()
+                try:
+                    chunk = await asyncio.wait_for(agen.__anext__(), budget)
+                except StopAsyncIteration:
+                    break
+                except Exception as e:
+                    settled = True
+                    raise self._failed(e) from e
+                yield chunk
+            settled = True
+            self.breaker.record_success()
+        except BaseException:
+            # 소비 측 중단 (GeneratorExit: SSE 연결 종료 / aclose / router 포기), 취소, deadline 초과
+            # → 결과 없이 끝난 시험 호출 슬롯 반납 (반납하지 않으면 half-open 상태에서 route 가 계속 차단됨)
+            if not settled:
+                self.breaker.release()
+            raise
+        finally:
+            await agen.aclose()
+
+    async def _open_stream(self, prompt: str, system: Optional[str], options: dict) -> Tuple[AsyncIterator[str], Optional[str]]:
+        timeout = await self._begin_attempt()
+        agen = self.provider.stream(prompt, system=system, **options)
+        try:
+            first = await asyncio.wait_for(agen.__anext__(), timeout)
+        except StopAsyncIteration:
+            first = None
+        except BaseException as e:
+            await agen.aclose()
+            if isinstance(e, asyncio.CancelledError):
+                self.breaker.release()
+                raise
+            raise self._failed(e) from e
+        return agen, first
+
+    async def _begin_attempt(self) -> float:
+        """breaker 확인 → 속도 제한 대기 → 이번 시도에 쓸 timeout 반환"""
+        self.breaker.before_call(self.name)
+        try:
+            left = deadline.remaining()
+            if left is None:
+                await self.limiter.acquire()
+            else:
+                try:
+                    await asyncio.wait_for(self.limiter.acquire(), max(left, 0.0))
+                except asyncio.TimeoutError:
+                    raise LLMDeadlineExceeded(f"deadline exceeded waiting for {self.name} rate limit", provider=self.name)
+            return self._attempt_budget()
+        except LLMError:
+            self.breaker.release()
+            raise
+
+    def _attempt_budget(self) -> float:
+        left = deadline.remaining()
+        if left is None:
+            return self.attempt_timeout
+        if left <= 0:
+            raise LLMDeadlineExceeded(f"deadline exceeded before calling {self.name}", provider=self.name)
+        return min(self.attempt_timeout, left)
+
+    def _failed(self, e: Exception) -> LLMError:
+        err = classify_error(e, provider=self.name)
+        if err.retryable:
+            self.breaker.record_failure()
+        else:
+            self.breaker.release()
+        self.errors += 1
+        return err
+
+    def _retrying(self) -> AsyncRetrying:
+        return AsyncRetrying(
+            stop=stop_after_attempt(self.max_attempts) | self._stop_at_deadline,
+            wait=wait_random_exponential(multiplier=self.backoff_base, max=self.backoff_max),
+            retry=retry_if_exception(lambda e: isinstance(e, LLMError) and e.retryable),
+            before_sleep=self._count_retry,
+            reraise=True,
+        )
+
+    @staticmethod
+    def _stop_at_deadline(retry_state: RetryCallState) -> bool:
+        # 다음 대기 시간이 남은 시간보다 길면 재시도해도 소용없음
+        left = deadline.remaining()
+        return left is not None and left <= (retry_state.upcoming_sleep or 0.0)
+
+    def _count_retry(self, retry_state: RetryCallState) -> None:
+        self.retries += 1
+
+    def stats(self) -> dict:
+        return {
+            "breaker": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "retries": self.retries,
+            "errors": self.errors,
+            "rate_per_sec": self.limiter.rate,
+        }
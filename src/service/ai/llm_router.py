@@ -0,0 +1,191 @@
+# service/ai/llm_router.py
+#
+# 프롬프트 세트별 provider 라우팅
+# - route: 이름 → ProviderGuard (provider/model 하나 + 속도 제한 / 재시도 / circuit breaker)
+# - policy: 프롬프트 세트 이름 → 선호 순서의 route 목록 (+ 선택적 지연 시간 상한)
+#   예) tip_report → ["fast", "default"], monthly_report → ["strong", "default"]
+# - 호출 순서: circuit 이 닫힌 route 우선, max_latency 가 있으면 상한 안쪽 route 우선,
+#   상한을 모두 넘으면 (EWMA 지연 × 진행 중 호출 수) 가 작은 순
+# - 한 route 가 재시도 후에도 실패하면 다음 route 로 failover (deadline 초과는 즉시 중단)
+
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+
+from service.ai.llm_errors import LLMDeadlineExceeded, LLMError
+from service.ai.llm_resilience import ProviderGuard
+from service.ai.providers import Completion
+
+DEFAULT_ROUTE = "default"
+
+
+class RoutePolicy(NamedTuple):
+    routes: Tuple[str, ...]
+    max_latency: Optional[float] = None     # 초, None 이면 순서만 사용
+
+
+class _RouteStats:
+    __slots__ = ("ewma", "inflight", "calls", "failures")
+
+    def __init__(self):
+        self.ewma: Optional[float] = None   # 성공 호출 지연 시간 EWMA (초)
+        self.inflight = 0
+        self.calls = 0
+        self.failures = 0
+
+    def load_score(self) -> float:
+        # 측정값이 없으면 0 → 한 번은 시도해 보도록
+        return (self.ewma or 0.0) * (1 + self.inflight)
+
+
+class LLMRouter:
+    def __init__(
+        self,
+        routes: Dict[str, ProviderGuard],
+        policies: Optional[Dict[str, RoutePolicy]] = None,
+        default: str = DEFAULT_ROUTE,
+        alpha: float = 0.2,
+    ):
+        if default not in routes:
+            raise ValueError(f"default route '{default}' is not registered")
+
+        self.routes = routes
+        self.default = default
+        self.alpha = alpha
+        self.policies: Dict[str, RoutePolicy] = {}
+        for name, policy in (policies or {}).items():
+            unknown = [r for r in policy.routes if r not in routes]
+            if unknown:
+                raise ValueError(f"routing for '{name}' references unknown routes: {unknown}")
+            self.policies[name] = policy
+
+        self._stats = {name: _RouteStats() for name in routes}
+        self.failovers = 0
+
+    # ------------------------
+    # 선택
+    # ------------------------
+    def candidates(self, prompt_set: str) -> List[str]:
+        """정책의 route 목록 (default 는 항상 마지막 대안으로 포함)"""
+        policy = self.policies.get(prompt_set)
+        names = list(policy.routes) if policy else []
+        if self.default not in names:
+            names.append(self.default)
+        return names
+
+    def select(self, prompt_set: str) -> List[str]:
+        """이번 호출에서 시도할 route 순서"""
+        names = self.candidates(prompt_set)
+        policy = self.policies.get(prompt_set)
+        max_latency = policy.max_latency if policy else None
+
+        ready = [n for n in names if self.routes[n].breaker.available()]
+        # circuit 이 열린 route 는 다른 route 가 모두 실패했을 때만 (즉시 실패하므로 비용 없음)
+        blocked = [n for n in names if n not in ready]
+
+        if max_latency is not None:
+            fast = [n for n in ready if (self._stats[n].ewma or 0.0) <= max_latency]
+            slow = sorted((n for n in ready if n not in fast), key=lambda n: self._stats[n].load_score())
+            ready = fast + slow
+        return ready + blocked
+
+    def policy_key(self, prompt_set: str) -> str:
+        """캐시 키용: 같은 정책이면 어느 route 가 응답했든 같은 키"""
+        return ",".join(self.routes[n].name for n in self.candidates(prompt_set))
+
+    # ------------------------
+    # 준비
+    # ------------------------
+    async def warmup(self) -> Dict[str, Optional[str]]:
+        """모든 route 의 provider 를 동시에 준비, route → 실패 사유 (성공 시 None)"""
+        names = list(self.routes)
+        results = await asyncio.gather(
+            *(self.routes[n].provider.warmup() for n in names), return_exceptions=True
+        )
+        return {
+            n: f"{type(r).__name__}: {r}" if isinstance(r, BaseException) else None
+            for n, r in zip(names, results)
+        }
+
+    async def aclose(self) -> None:
+        """route 별 provider 정리 (같은 provider 를 여러 route 가 공유해도 1회)"""
+        providers = {id(guard.provider): guard.provider for guard in self.routes.values()}
+        await asyncio.gather(*(p.aclose() for p in providers.values()))
+
+    # ------------------------
+    # 호출
+    # ------------------------
+    async def generate(self, prompt_set: str, prompt: str, *, system: Optional[str] = None, **options) -> Tuple[Completion, str]:
+        last_error: Optional[LLMError] = None
+        for name in self.select(prompt_set):
+            stats = self._stats[name]
+            started = time.perf_counter()
+            stats.inflight += 1
+            try:
+                completion = await self.routes[name].generate(prompt, system=system, **options)
+            except LLMDeadlineExceeded:
+                raise
+            except LLMError as e:
+                stats.failures += 1
+                last_error = e
+                self.failovers += 1
+                continue
+            finally:
+                stats.inflight -= 1
+
+            self._observe(name, time.perf_counter() - started)
+            return completion, name
+
+        raise last_error
+
+    async def stream(self, prompt_set: str, prompt: str, *, system: Optional[str] = None, **options) -> AsyncIterator[str]:
+        """첫 조각을 받기 전에 실패하면 다음 route 로 failover, 이후 실패는 그대로 전파"""
+        last_error: Optional[LLMError] = None
+        for name in self.select(prompt_set):
+            stats = self._stats[name]
+            started = time.perf_counter()
+            agen = self.routes[name].stream(prompt, system=system, **options)
+            stats.inflight += 1
+            try:
+                try:
+                    first = await agen.__anext__()
+                except StopAsyncIteration:
+                    first = None
+                except LLMDeadlineExceeded:
+                    raise
+                except LLMError as e:
+                    stats.failures += 1
+                    last_error = e
+                    self.failovers += 1
+                    continue
+
+                if first is not None:
+                    yield first
+                    async for chunk in agen:
+                        yield chunk
+                self._observe(name, time.perf_counter() - started)
+                return
+            finally:
+                stats.inflight -= 1
+                await agen.aclose()
+
+        raise last_error
+
+    def _observe(self, name: str, elapsed: float) -> None:
+        stats = self._stats[name]
+        stats.calls += 1
+        stats.ewma = elapsed if stats.ewma is None else (1 - self.alpha) * stats.ewma + self.alpha * elapsed
+
+    def stats(self) -> dict:
+        routes = {}
+        for name, guard in self.routes.items():
+            s = self._stats[name]
+            routes[name] = {
+                "model": guard.name,
+                "latency_ewma": round(s.ewma, 4) if s.ewma is not None else None,
+                "inflight": s.inflight,
+                "calls": s.calls,
+                "failures": s.failures,
+                **guard.stats(),
+            }
+        return {"failovers": self.failovers, "routes": routes}
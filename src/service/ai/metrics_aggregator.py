@@ -0,0 +1,191 @@
+# service/ai/metrics_aggregator.py
+#
+# telemetry 원시 샘플 → 프롬프트용 요약
+# - 항목별 min / max / mean / 백분위수
+# - 시간(hour) 또는 일(day) 버킷별 평균 / 최대
+# - analysis_criteria 구간별 체류 비율
+# 원시 배열 대신 요약을 넘겨 프롬프트 토큰과 직렬화 비용을 줄임
+# (응답 → 항목별 배열 변환은 telemetry_frame.TelemetryFrame)
+# - 일별 rollup: 하루치 샘플을 합칠 수 있는 집계(개수 / 합 / 최소 / 최대 / 구간별 개수 / 분위수 sketch)로 축약
+#   월간 요약은 지난 날들의 rollup + 오늘 원시 샘플의 rollup 을 합쳐 계산
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from service.ai.criteria import CompiledCriteria
+
+METRIC_KEYS = ("dust", "co2", "tvoc", "temp", "humi")
+TIMESTAMP_KEYS = ("ts", "timestamp", "time", "t")
+PERCENTILES = (50, 90, 95)
+
+_BUCKET_SECONDS = {"hour": 3600, "day": 86400}
+_BUCKET_LABELS = {"hour": "%m-%d %H:00", "day": "%Y-%m-%d"}
+
+Series = Tuple[Optional[np.ndarray], np.ndarray]     # (timestamps(epoch sec) | None, values)
+
+
+def summarize_metrics(
+    series: Mapping[str, Series],
+    criteria: Optional[CompiledCriteria] = None,
+    *,
+    bucket: str = "hour",
+    tz: str = "Asia/Seoul",
+) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {}
+    for key, (ts, values) in series.items():
+        bands = criteria[key] if criteria is not None and key in criteria else None
+        summary[key] = _summarize_one(ts, values, bands, bucket, tz)
+    return summary
+
+
+def _summarize_one(ts, values: np.ndarray, bands, bucket: str, tz: str) -> Dict[str, Any]:
+    n = len(values)
+    out: Dict[str, Any] = {"count": n}
+    if bands is not None:
+        out["unit"] = bands.unit
+    if n == 0:
+        return out
+
+    pcts = np.percentile(values, PERCENTILES)
+    out.update({
+        "min": _r(values.min()),
+        "max": _r(values.max()),
+        "mean": _r(values.mean()),
+    })
+    for p, v in zip(PERCENTILES, pcts):
+        out[f"p{p}"] = _r(v)
+
+    if bands is not None:
+        out["bands"] = {k: _r(v, 3) for k, v in bands.fractions(values).items()}
+
+    if ts is not None and len(ts) == n:
+        out["buckets"] = _bucketize(ts, values, bucket, tz)
+
+    return out
+
+
+def _bucketize(ts: np.ndarray, values: np.ndarray, bucket: str, tz: str):
+    width = _BUCKET_SECONDS[bucket]
+    zone = ZoneInfo(tz)
+    offset = zone.utcoffset(datetime.now(zone)).total_seconds()
+
+    bucket_ids = np.floor((ts + offset) / width).astype(np.int64)
+    uniq, inverse = np.unique(bucket_ids, return_inverse=True)
+
+    counts = np.bincount(inverse)
+    means = np.bincount(inverse, weights=values) / counts
+    maxes = np.full(len(uniq), -np.inf)
+    np.maximum.at(maxes, inverse, values)
+
+    fmt = _BUCKET_LABELS[bucket]
+    labels = [
+        (datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=int(b) * width)).strftime(fmt)
+        for b in uniq
+    ]
+    return [
+        {"t": label, "mean": _r(m), "max": _r(x)}
+        for label, m, x in zip(labels, means, maxes)
+    ]
+
+
+def _r(v, digits: int = 1) -> float:
+    return round(float(v), digits)
+
+
+# ------------------------
+# 일별 rollup
+# ------------------------
+def rollup_series(
+    series: Mapping[str, Series],
+    criteria: Optional[CompiledCriteria] = None,
+    sketch_size: int = 101,
+) -> Dict[str, dict]:
+    """
+    하루치 샘플 → 항목별 집계 (JSON 직렬화 가능한 dict)
+    - count / sum / min / max / 구간별 개수는 정확히 합산 가능
+    - 분위수는 균등 간격 분위수 sketch_size 개로 근사 (합칠 때 개수 가중)
+    """
+    rollup: Dict[str, dict] = {}
+    for key, (_, values) in series.items():
+        n = len(values)
+        if n == 0:
+            rollup[key] = {"count": 0}
+            continue
+
+        item = {
+            "count": n,
+            "sum": float(values.sum()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "sketch": np.quantile(values, np.linspace(0.0, 1.0, min(sketch_size, n))).tolist(),
+        }
+        bands = criteria[key] if criteria is not None and key in criteria else None
+        if bands is not None:
+            counts = np.bincount(bands.classify(values), minlength=len(bands.levels))
+            item["bands"] = {level: int(c) for level, c in zip(bands.levels, counts)}
+        rollup[key] = item
+    return rollup
+
+
+def summarize_rollups(
+    days: Sequence[Tuple[str, Dict[str, dict]]],
+    criteria: Optional[CompiledCriteria] = None,
+) -> Dict[str, Any]:
+    """
+    (날짜 라벨, rollup) 목록 → summarize_metrics(bucket="day") 와 같은 형태의 요약
+    일별 버킷의 평균 / 최대와 전체 min / max / mean / 구간 비율은 정확, 백분위수는 sketch 근사
+    """
+    summary: Dict[str, Any] = {}
+    for key in METRIC_KEYS:
+        parts = [(label, r[key]) for label, r in days if r.get(key, {}).get("count")]
+        n = sum(item["count"] for _, item in parts)
+
+        bands = criteria[key] if criteria is not None and key in criteria else None
+        out: Dict[str, Any] = {"count": n}
+        if bands is not None:
+            out["unit"] = bands.unit
+        if n == 0:
+            summary[key] = out
+            continue
+
+        out.update({
+            "min": _r(min(item["min"] for _, item in parts)),
+            "max": _r(max(item["max"] for _, item in parts)),
+            "mean": _r(sum(item["sum"] for _, item in parts) / n),
+        })
+        for p, v in zip(PERCENTILES, _merged_percentiles([item for _, item in parts])):
+            out[f"p{p}"] = _r(v)
+
+        if bands is not None:
+            totals = dict.fromkeys(bands.levels, 0)
+            for _, item in parts:
+                for level, c in (item.get("bands") or {}).items():
+                    if level in totals:
+                        totals[level] += c
+            out["bands"] = {level: _r(c / n, 3) for level, c in totals.items()}
+
+        out["buckets"] = [
+            {"t": label, "mean": _r(item["sum"] / item["count"]), "max": _r(item["max"])}
+            for label, item in parts
+        ]
+        summary[key] = out
+    return summary
+
+
+def _merged_percentiles(items: List[dict]) -> np.ndarray:
+    # 각 sketch 점이 (그날 개수 / 점 개수) 만큼의 샘플을 대표한다고 보고 가중 분위수 계산
+    values = np.concatenate([np.asarray(item["sketch"], dtype=np.float64) for item in items])
+    weights = np.concatenate([
+        np.full(len(item["sketch"]), item["count"] / len(item["sketch"])) for item in items
+    ])
+    order = np.argsort(values, kind="stable")
+    values, weights = values[order], weights[order]
+
+    cum = np.cumsum(weights)
+    # 점 중심 위치를 0~1 로 정규화 (단일 sketch 면 np.percentile 의 선형 보간과 같은 위치)
+    pos = (cum - weights / 2) - (cum[0] - weights[0] / 2)
+    span = pos[-1] if pos[-1] > 0 else 1.0
+    return np.interp(np.asarray(PERCENTILES, dtype=np.float64) / 100.0, pos / span, values)
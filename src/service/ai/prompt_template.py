@@ -0,0 +1,137 @@
+# service/ai/prompt_template.py
+#
+# 프롬프트 세트(prompts_cfg 의 리스트)를 시작 시 1회 컴파일
+# - 조각들을 미리 합치고 {{ name }} 위치에서 정적 구간 / 슬롯으로 분리
+# - render(): 슬롯 값만 orjson 으로 1회 직렬화 후 단일 join
+# - 선언된 치환 변수와 실제 슬롯이 다르면 로드 시점에 오류
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import orjson
+
+PLACEHOLDER_RE = re.compile(r"\{\{\s*([A-Za-z0-9_]+)\s*\}\}")
+FRAGMENT_SEPARATOR = "\n\n"
+
+_ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class PromptTemplateError(ValueError):
+    pass
+
+
+def serialize_value(val: Any) -> str:
+    if val is None:
+        return ""
+    if isinstance(val, str):
+        return val
+    if isinstance(val, (bool, int, float)):
+        return str(val)
+    if isinstance(val, (dict, list, tuple)):
+        return orjson.dumps(val, option=_ORJSON_OPTIONS, default=repr).decode("utf-8")
+    return repr(val)
+
+
+class PromptTemplate:
+    def __init__(self, name: str, fragments: Union[str, Sequence[str]]):
+        self.name = name
+
+        if isinstance(fragments, str):
+            fragments = [fragments]
+        fragments = [str(f) for f in fragments if f]
+
+        # 앞쪽의 슬롯 없는 조각들 = 정적 prefix (system instruction 으로 분리 가능)
+        split = 0
+        while split < len(fragments) and not PLACEHOLDER_RE.search(fragments[split]):
+            split += 1
+        self.prefix = FRAGMENT_SEPARATOR.join(fragments[:split])
+        suffix = FRAGMENT_SEPARATOR.join(fragments[split:])
+
+        # parts: [정적, None(슬롯), 정적, None, ...] → 렌더 시 슬롯 위치만 채움
+        parts: List[Optional[str]] = []
+        slot_index: List[Tuple[int, str]] = []
+        pos = 0
+        for m in PLACEHOLDER_RE.finditer(suffix):
+            parts.append(suffix[pos:m.start()])
+            slot_index.append((len(parts), m.group(1)))
+            parts.append(None)
+            pos = m.end()
+        parts.append(suffix[pos:])
+
+        self._parts = parts
+        self._slot_index = tuple(slot_index)
+        self.slots = frozenset(name for _, name in slot_index)
+
+    @property
+    def is_static(self) -> bool:
+        return not self.slots
+
+    def validate(self, expected: Iterable[str]) -> None:
+        expected = frozenset(expected)
+        if expected == self.slots:
+            return
+
+        missing = sorted(self.slots - expected)
+        unused = sorted(expected - self.slots)
+        raise PromptTemplateError(
+            f"prompt set '{self.name}': undeclared slots={missing}, declared but unused={unused}"
+        )
+
+    def render(self, values: Optional[Dict[str, Any]] = None) -> str:
+        prefix, suffix = self.render_split(values)
+        if prefix and suffix:
+            return prefix + FRAGMENT_SEPARATOR + suffix
+        return prefix or suffix
+
+    def render_split(self, values: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+        """(정적 prefix, 치환된 동적 suffix)"""
+        if not self._slot_index:
+            return self.prefix, self._parts[0]
+
+        values = values or {}
+        missing = self.slots - values.keys()
+        if missing:
+            raise PromptTemplateError(f"prompt set '{self.name}': missing placeholders {sorted(missing)}")
+
+        # 같은 변수가 여러 번 등장해도 직렬화는 1회
+        serialized = {name: serialize_value(values[name]) for name in self.slots}
+
+        parts = self._parts.copy()
+        for i, name in self._slot_index:
+            parts[i] = serialized[name]
+        return self.prefix, "".join(parts)
+
+
+class PromptRegistry:
+    """프롬프트 세트(조각 리스트) → 컴파일된 템플릿"""
+
+    def __init__(self):
+        # 조각 튜플을 키로 사용 (str 해시는 객체에 캐시되므로 조회 비용이 작음)
+        self._by_fragments: Dict[Tuple[str, ...], PromptTemplate] = {}
+        self._by_name: Dict[str, PromptTemplate] = {}
+
+    def register(self, name: str, fragments: Sequence[str], placeholders: Iterable[str]) -> PromptTemplate:
+        template = PromptTemplate(name, fragments)
+        template.validate(placeholders)
+
+        self._by_fragments[tuple(fragments)] = template
+        self._by_name[name] = template
+        return template
+
+    def register_all(self, prompt_sets: Dict[str, Tuple[Sequence[str], Iterable[str]]]) -> None:
+        for name, (fragments, placeholders) in prompt_sets.items():
+            self.register(name, fragments, placeholders)
+
+    def get(self, name: str) -> PromptTemplate:
+        return self._by_name[name]
+
+    def lookup(self, prompt: Union[str, Sequence[str]]) -> PromptTemplate:
+        """등록된 세트면 컴파일된 템플릿, 아니면 즉석 컴파일"""
+        if not isinstance(prompt, str):
+            template = self._by_fragments.get(tuple(prompt))
+            if template is not None:
+                return template
+        return PromptTemplate("<inline>", prompt)
+
+    def names(self) -> List[str]:
+        return list(self._by_name)
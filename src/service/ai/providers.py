@@ -0,0 +1,316 @@
+# service/ai/providers.py
+#
+# LLM provider 구현
+# - GeminiProvider: google.generativeai async API 사용
+#   정적 프롬프트 prefix 는 system_instruction 으로 등록한 모델 인스턴스를 prefix 별로 재사용
+#   SDK (gRPC 포함) import 가 무거우므로 생성 시가 아니라 warmup / 첫 호출 시 불러옴
+# - OpenAICompatProvider: /v1/chat/completions 호환 HTTP 엔드포인트 (vLLM, LM Studio 등)
+# - OllamaProvider: 로컬 Ollama /api/chat
+# - StubProvider  : 네트워크 없이 고정 응답 (로컬 테스트용)
+#   HTTP 기반 provider 는 AppContext 의 공용 AsyncClient 를 사용
+
+import asyncio
+import hashlib
+import os
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional
+
+import httpx
+import orjson
+
+from common.startup_report import STARTUP
+
+
+class Completion(NamedTuple):
+    text: str
+    prompt_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 (한글 포함 텍스트 기준 약 3자당 1토큰)"""
+    return (len(text) + 2) // 3 if text else 0
+
+
+class LLMProvider:
+    name = "base"
+
+    def __init__(self, model: str):
+        self.model = model
+
+    async def warmup(self) -> None:
+        """첫 호출 전에 끝내 둘 준비 작업 (SDK import 등), 기본은 없음"""
+        return None
+
+    async def aclose(self) -> None:
+        """provider 가 직접 만든 자원 정리 (공용 클라이언트 등 빌려 쓴 자원은 닫지 않음), 기본은 없음"""
+        return None
+
+    async def generate(self, prompt: str, *, system: Optional[str] = None, **options) -> Completion:
+        raise NotImplementedError
+
+    async def stream(self, prompt: str, *, system: Optional[str] = None, **options) -> AsyncIterator[str]:
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+
+class GeminiProvider(LLMProvider):
+    name = "gemini"
+
+    def __init__(self, model: str, api_key: Optional[str] = None):
+        super().__init__(model)
+
+        # 보안을 위해 환경 변수에서 API 키를 가져옵니다.
+        api_key = api_key or os.environ.get("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
+
+        self._api_key = api_key
+        self._sdk = None
+        # system_instruction(정적 prefix) 별 모델 인스턴스
+        self._models: Dict[Optional[str], Any] = {}
+
+    @property
+    def _genai(self):
+        # warmup 전에 호출되면 여기서 import (이벤트 루프를 잠시 막음)
+        if self._sdk is None:
+            self._load_sdk()
+        return self._sdk
+
+    def _load_sdk(self) -> None:
+        genai = STARTUP.timed_import("google.generativeai")
+        genai.configure(api_key=self._api_key)
+        self._sdk = genai
+
+    async def warmup(self) -> None:
+        if self._sdk is None:
+            await asyncio.to_thread(self._load_sdk)
+
+    def _model_for(self, system: Optional[str]):
+        key = hashlib.sha256(system.encode("utf-8")).hexdigest() if system else None
+        model = self._models.get(key)
+        if model is None:
+            model = self._genai.GenerativeModel(self.model, system_instruction=system or None)
+            self._models[key] = model
+        return model
+
+    async def generate(self, prompt: str, *, system: Optional[str] = None, **options) -> Completion:
+        # Gemini API 옵션을 GenerationConfig로 변환합니다.
+        generation_config = self._genai.types.GenerationConfig(**options)
+        response = await self._model_for(system).generate_content_async(
+            prompt,
+            generation_config=generation_config
+        )
+
+        usage = getattr(response, "usage_metadata", None)
+        return Completion(
+            text=response.text,
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            output_tokens=getattr(usage, "candidates_token_count", None),
+        )
+
+    async def stream(self, prompt: str, *, system: Optional[str] = None, **options) -> AsyncIterator[str]:
+        generation_config = self._genai.types.GenerationConfig(**options)
+        response = await self._model_for(system).generate_content_async(
+            prompt,
+            generation_config=generation_config,
+            stream=True
+        )
+        async for chunk in response:
+            text = chunk.text
+            if text:
+                yield text
+
+
+def _chat_messages(prompt: str, system: Optional[str]) -> List[Dict[str, str]]:
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+class _HTTPProvider(LLMProvider):
+    """공용 AsyncClient 로 JSON POST 하는 provider 공통 부분"""
+
+    default_base_url = ""
+
+    def __init__(
+        self,
+        model: str,
+        *,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        timeout: float = 120.0,
+    ):
+        super().__init__(model)
+        self.base_url = (base_url or self.default_base_url).rstrip("/")
+        self.api_key = api_key
+        # 공용 클라이언트가 없으면 (단독 사용 등) 자체 생성 → aclose() 에서 닫음
+        self._owns_client = http_client is None
+        self._client = http_client or httpx.AsyncClient()
+        self.timeout = timeout
+
+    async def aclose(self) -> None:
+        if self._owns_client and not self._client.is_closed:
+            await self._client.aclose()
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    async def _post(self, path: str, body: dict) -> Any:
+        r = await self._client.post(
+            self.base_url + path, content=orjson.dumps(body),
+            headers={"Content-Type": "application/json", **self._headers()}, timeout=self.timeout,
+        )
+        r.raise_for_status()
+        return orjson.loads(r.content)
+
+    async def _post_lines(self, path: str, body: dict) -> AsyncIterator[str]:
+        async with self._client.stream(
+            "POST", self.base_url + path, content=orjson.dumps(body),
+            headers={"Content-Type": "application/json", **self._headers()}, timeout=self.timeout,
+        ) as r:
+            r.raise_for_status()
+            async for line in r.aiter_lines():
+                if line:
+                    yield line
+
+
+class OpenAICompatProvider(_HTTPProvider):
+    name = "openai"
+    default_base_url = "https://api.openai.com/v1"
+
+    # GenerationConfig 식 옵션 이름 → chat completions 파라미터
+    OPTION_MAP = {"temperature": "temperature", "top_p": "top_p", "max_output_tokens": "max_tokens"}
+
+    def _body(self, prompt: str, system: Optional[str], options: dict, stream: bool) -> dict:
+        body = {"model": self.model, "messages": _chat_messages(prompt, system), "stream": stream}
+        for key, value in options.items():
+            if key in self.OPTION_MAP:
+                body[self.OPTION_MAP[key]] = value
+        return body
+
+    async def generate(self, prompt: str, *, system: Optional[str] = None, **options) -> Completion:
+        data = await self._post("/chat/completions", self._body(prompt, system, options, stream=False))
+        usage = data.get("usage") or {}
+        return Completion(
+            text=data["choices"][0]["message"]["content"] or "",
+            prompt_tokens=usage.get("prompt_tokens"),
+            output_tokens=usage.get("completion_tokens"),
+        )
+
+    async def stream(self, prompt: str, *, system: Optional[str] = None, **options) -> AsyncIterator[str]:
+        # SSE: "data: {...}" 줄 단위, 마지막은 "data: [DONE]"
+        async for line in self._post_lines("/chat/completions", self._body(prompt, system, options, stream=True)):
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            choices = orjson.loads(data).get("choices") or []
+            text = choices[0].get("delta", {}).get("content") if choices else None
+            if text:
+                yield text
+
+
+class OllamaProvider(_HTTPProvider):
+    name = "ollama"
+    default_base_url = "http://localhost:11434"
+
+    OPTION_MAP = {"temperature": "temperature", "top_p": "top_p", "top_k": "top_k", "max_output_tokens": "num_predict"}
+
+    def _body(self, prompt: str, system: Optional[str], options: dict, stream: bool) -> dict:
+        return {
+            "model": self.model,
+            "messages": _chat_messages(prompt, system),
+            "stream": stream,
+            "options": {self.OPTION_MAP[k]: v for k, v in options.items() if k in self.OPTION_MAP},
+        }
+
+    async def generate(self, prompt: str, *, system: Optional[str] = None, **options) -> Completion:
+        data = await self._post("/api/chat", self._body(prompt, system, options, stream=False))
+        return Completion(
+            text=(data.get("message") or {}).get("content", ""),
+            prompt_tokens=data.get("prompt_eval_count"),
+            output_tokens=data.get("eval_count"),
+        )
+
+    async def stream(self, prompt: str, *, system: Optional[str] = None, **options) -> AsyncIterator[str]:
+        # NDJSON: 줄마다 {"message": {"content": ...}, "done": bool}
+        async for line in self._post_lines("/api/chat", self._body(prompt, system, options, stream=True)):
+            data = orjson.loads(line)
+            text = (data.get("message") or {}).get("content")
+            if text:
+                yield text
+            if data.get("done"):
+                break
+
+
+class StubProvider(LLMProvider):
+    """
+    로컬 테스트용 provider (API 키 / 네트워크 불필요)
+    모든 리포트 유형의 필드를 담은 고정 JSON 을 ```json 블록으로 반환
+    """
+    name = "stub"
+
+    DEFAULT_REPORT = {
+        "aiDailyReport": "실내 환경이 전반적으로 양호합니다.",
+        "aiAnalysis": [
+            "환기를 주기적으로 해 주세요.",
+            "습도를 40~60%로 유지하세요.",
+            "미세먼지 수치를 꾸준히 확인하세요.",
+        ],
+        "aiMonthlyReport": "이번 달 실내 환경은 대체로 양호했습니다.",
+        "category": ["방 청소하기", "바닥 청소하기", "침구 관리하기"],
+    }
+
+    def __init__(self, model: str = "stub", response: Optional[str] = None, chunk_size: int = 16):
+        super().__init__(model)
+        self.response = response or (
+            "```json\n" + orjson.dumps(self.DEFAULT_REPORT, option=orjson.OPT_INDENT_2).decode() + "\n```"
+        )
+        self.chunk_size = chunk_size
+        self.calls = 0
+        self.last_system: Optional[str] = None
+        self.last_prompt: Optional[str] = None
+
+    async def generate(self, prompt: str, *, system: Optional[str] = None, **options) -> Completion:
+        self.calls += 1
+        self.last_system, self.last_prompt = system, prompt
+        return Completion(
+            text=self.response,
+            prompt_tokens=estimate_tokens(system or "") + estimate_tokens(prompt),
+            output_tokens=estimate_tokens(self.response),
+        )
+
+    async def stream(self, prompt: str, *, system: Optional[str] = None, **options) -> AsyncIterator[str]:
+        self.calls += 1
+        self.last_system, self.last_prompt = system, prompt
+        for i in range(0, len(self.response), self.chunk_size):
+            yield self.response[i:i + self.chunk_size]
+
+
+PROVIDER_TYPES = {
+    "gemini": GeminiProvider,
+    "openai": OpenAICompatProvider,
+    "ollama": OllamaProvider,
+    "stub": StubProvider,
+}
+
+
+def create_provider(
+    provider: str,
+    model: str,
+    *,
+    base_url: Optional[str] = None,
+    api_key_env: Optional[str] = None,
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> LLMProvider:
+    if provider == "gemini":
+        return GeminiProvider(model, api_key=os.environ.get(api_key_env) if api_key_env else None)
+    if provider in ("openai", "ollama"):
+        # 로컬 호환 서버는 키 없이도 동작하므로 키는 선택
+        api_key = os.environ.get(api_key_env or "OPENAI_API_KEY") if provider == "openai" else None
+        return PROVIDER_TYPES[provider](model, base_url=base_url, api_key=api_key, http_client=http_client)
+    if provider == "stub":
+        return StubProvider(model)
+    raise ValueError(f"Unsupported provider: {provider}. Supported providers are {', '.join(map(repr, PROVIDER_TYPES))}.")
@@ -0,0 +1,102 @@
+# service/ai/report_scheduler.py
+#
+# 리포트 사전 계산 스케줄러
+# - AppFactory._startup 에서 시작, 리포트 종류별 주기로 현재 구간 리포트를 갱신
+# - telemetry 가 바뀌지 않았으면 프롬프트가 동일하므로 LLM 응답 캐시가 재사용됨 (증분 갱신)
+# - 워커가 여러 개면 리포트 저장소의 lease 를 가진 워커 하나만 갱신
+#   (나머지는 저장소에서 읽기만 함, lease 를 가진 워커가 죽으면 lease_ttl 이 지난 뒤 다른 워커가 이어받음)
+
+import asyncio
+import os
+import socket
+import time
+from typing import Dict, Optional
+
+from service.ai import report_service
+
+
+class ReportScheduler:
+    LEASE = "report-scheduler"
+
+    def __init__(self, ctx, intervals: Dict[str, float], tick: float = 5.0, lease_ttl: float = 120.0):
+        self.ctx = ctx
+        self.intervals = {kind: sec for kind, sec in intervals.items() if sec and sec > 0}
+        self.tick = tick
+        self.lease_ttl = lease_ttl
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.leader = False
+        self._next_run = {kind: 0.0 for kind in self.intervals}
+        self._last_key: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self.runs = 0
+        self.failures = 0
+
+    def start(self) -> None:
+        if self._task is None and self.intervals:
+            self._task = asyncio.create_task(self._run(), name="report-scheduler")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        if self.leader:
+            # 다른 워커가 lease_ttl 을 기다리지 않고 바로 이어받도록
+            self.leader = False
+            await asyncio.to_thread(self.ctx.report_store.release_lease, self.LEASE, self.owner)
+
+    async def _hold_lease(self) -> bool:
+        """lease 선점 / 연장 (리포트 갱신마다 다시 확인 → LLM 호출이 길어도 lease_ttl 안에서 연장)"""
+        store = self.ctx.report_store
+        try:
+            leader = await asyncio.to_thread(store.acquire_lease, self.LEASE, self.owner, self.lease_ttl)
+        except Exception as e:
+            leader = False
+            if self.ctx.log:
+                self.ctx.log.warning(f"[REPORT] scheduler lease check failed: {e}")
+
+        if leader != self.leader and self.ctx.log:
+            self.ctx.log.info(f"[REPORT] scheduler lease {'acquired' if leader else 'lost'} ({self.owner})")
+        self.leader = leader
+        return leader
+
+    async def _run(self) -> None:
+        while True:
+            now = time.time()
+            # lease 는 갱신할 리포트가 없어도 tick 마다 연장
+            leader = await self._hold_lease()
+            for kind, interval in self.intervals.items():
+                if not leader:
+                    break
+                key, _ = report_service.report_key(kind)
+
+                # 주기가 되었거나 날/달이 바뀌어 구간 키가 달라진 경우 갱신
+                if now < self._next_run[kind] and self._last_key.get(kind) == key:
+                    continue
+
+                await self._refresh(kind)
+                self._last_key[kind] = key
+                self._next_run[kind] = time.time() + interval
+                leader = await self._hold_lease()
+
+            await asyncio.sleep(self.tick)
+
+    async def _refresh(self, kind: str) -> None:
+        log = self.ctx.log
+        started = time.perf_counter()
+        try:
+            await report_service.refresh_report(self.ctx, kind)
+            self.runs += 1
+            if log:
+                log.debug(f"[REPORT] precomputed '{kind}' in {time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            self.failures += 1
+            if log:
+                log.warning(f"[REPORT] precompute '{kind}' failed: {e}")
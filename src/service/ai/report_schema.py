@@ -0,0 +1,68 @@
+# service/ai/report_schema.py
+#
+# 리포트 종류별 LLM 응답 스키마
+# - 응답 텍스트 → json_stream.extract_json_object (한 번 스캔 + orjson) → pydantic 모델 검증
+# - 모델 검증기는 클래스 정의 시 1회 컴파일 (pydantic-core), 요청마다 만들지 않음
+# - JSON 객체가 없으면 LLMResponseFormatError, 스키마 위반이면 LLMResponseSchemaError (빈 dict 로 숨기지 않음)
+# - 모르는 필드는 버림 (프롬프트 출력 형식에 있는 필드만 응답으로 전달)
+
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from service.ai.json_stream import extract_json_object
+from service.ai.llm_errors import LLMResponseFormatError, LLMResponseSchemaError
+
+
+class _Report(BaseModel):
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+
+class DailyReport(_Report):
+    aiDailyReport: str = Field(min_length=1)
+    aiAnalysis: List[str] = Field(min_length=1)
+    aiDailyScore: Optional[int] = None      # 로컬 엔진 점수로 덮어씀
+
+
+class MonthlyReport(_Report):
+    aiMonthlyReport: str = Field(min_length=1)
+
+
+class CategoryReport(_Report):
+    category: List[str] = Field(min_length=1)
+
+
+# 리포트 종류 (report_service.REPORT_KINDS) → 응답 모델
+REPORT_MODELS: Dict[str, Type[_Report]] = {
+    "daily": DailyReport,
+    "monthly": MonthlyReport,
+    "tip": CategoryReport,
+}
+
+# 프롬프트 세트 이름 (prompts_cfg.PROMPT_SETS) → 리포트 종류
+PROMPT_SET_KINDS: Dict[str, str] = {
+    "daily_report": "daily",
+    "monthly_report": "monthly",
+    "tip_report": "tip",
+}
+
+
+def validate_report(kind: Optional[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    """kind 가 None 이면 검증 없이 그대로"""
+    model = REPORT_MODELS.get(kind) if kind else None
+    if model is None:
+        return data
+
+    try:
+        return model.model_validate(data).model_dump()
+    except ValidationError as e:
+        errors = e.errors(include_url=False, include_context=False, include_input=False)
+        fields = ", ".join(".".join(str(p) for p in err["loc"]) + f" ({err['type']})" for err in errors)
+        raise LLMResponseSchemaError(f"{kind} report schema violation: {fields}", errors=errors) from None
+
+
+def parse_report(text: str, kind: Optional[str] = None) -> Dict[str, Any]:
+    data = extract_json_object(text or "")
+    if data is None:
+        raise LLMResponseFormatError(f"no JSON object in LLM response ({len(text or '')} chars)")
+    return validate_report(kind, data)
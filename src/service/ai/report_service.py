@@ -0,0 +1,409 @@
+# service/ai/report_service.py
+#
+# 리포트 생성 로직 (llm_api 라우터 / 백그라운드 스케줄러 공용)
+# - telemetry 조회 → 요약 / 로컬 점수 → LLM 문장 생성 → 파싱
+# - 월간 요약은 지난 날의 일별 rollup + 오늘 원시 샘플 (rollup 저장소가 없으면 한 달치 조회)
+# - push 수신 (ctx.telemetry_ingest) 중인 scope 는 ring buffer 에서 읽고 덮지 못한 앞부분만 백엔드 조회
+# - get_report(): 사전 계산된 리포트가 충분히 최신이면 그대로, 아니면 즉시 생성 후 저장
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import orjson
+
+from common.metrics import span
+from common.trace_context import TRACE_HEADER, current_trace_id
+from service.ai.asset.prompts.prompts_cfg import (DAILY_REPORT_PROMPTS,
+                                                  MONTHLY_REPORT_PROMPTS,
+                                                  TIP_REPORT_PROMPTS)
+from service.ai.criteria import CompiledCriteria
+from service.ai.metrics_aggregator import rollup_series, summarize_metrics, summarize_rollups
+from service.ai.telemetry_frame import TelemetryFrame
+from service.ai.telemetry_ingest import scope_key
+
+DEFAULT_BACKEND_URL = "https://bangtori-be.onrender.com/api"
+LLM_TEMPERATURE = 0.7
+ROLLUP_BACKFILL_CONCURRENCY = 4     # rollup 이 없는 날을 채울 때 동시 조회 수
+
+
+# ------------------------
+# 조회 구간
+# ------------------------
+def today_window() -> Tuple[datetime, datetime]:
+    """오늘 0시 ~ 내일 0시 (서울 고정)"""
+    today = datetime.now(ZoneInfo("Asia/Seoul")).date()
+    start_dt = datetime(today.year, today.month, today.day, tzinfo=ZoneInfo("Asia/Seoul"))
+    return start_dt, start_dt + timedelta(days=1)
+
+
+def month_window() -> Tuple[datetime, datetime]:
+    """이번 달 1일 ~ 다음 달 1일 (서울 고정)"""
+    today = datetime.now(ZoneInfo("Asia/Seoul")).date()
+    start_dt = datetime(today.year, today.month, 1, tzinfo=ZoneInfo("Asia/Seoul"))
+
+    if today.month == 12:  # 12월이면 다음 해 1월
+        end_dt = datetime(today.year + 1, 1, 1, tzinfo=ZoneInfo("Asia/Seoul"))
+    else:
+        end_dt = datetime(today.year, today.month + 1, 1, tzinfo=ZoneInfo("Asia/Seoul"))
+    return start_dt, end_dt
+
+
+# ------------------------
+# 백엔드 조회
+# ------------------------
+def telemetry_url(ctx) -> str:
+    base_url = getattr(ctx, "host", DEFAULT_BACKEND_URL)
+    return f"{base_url}/telemetry/range"
+
+
+async def fetch_json(ctx, url: str, params: Optional[dict] = None) -> Any:
+    """
+    AppContext 가 소유한 공용 AsyncClient 로 GET 후 JSON 반환
+    (요청마다 클라이언트를 만들지 않으므로 커넥션 풀 / keep-alive 가 재사용됨)
+    """
+    return orjson.loads(await fetch_bytes(ctx, url, params))
+
+
+async def fetch_bytes(ctx, url: str, params: Optional[dict] = None) -> bytes:
+    """공용 AsyncClient 로 GET 후 응답 본문 그대로 반환"""
+    client = ctx.http_client
+    if client is None:
+        raise RuntimeError("http client is not initialized")
+
+    # 백엔드 로그와 연결할 수 있도록 trace id 전달
+    trace_id = current_trace_id()
+    headers = {TRACE_HEADER: trace_id} if trace_id else None
+
+    r = await client.get(url, params=params, headers=headers)
+    r.raise_for_status()
+    return r.content
+
+
+async def fetch_telemetry(
+    ctx, metrics_url: str, start_epoch: int, end_epoch: int, scope: Optional[Mapping[str, str]] = None
+) -> TelemetryFrame:
+    """
+    /telemetry/range 조회 → 항목별 배열 (TelemetryFrame)
+    - scope: 대상 집/기기 지정용 추가 쿼리 (예: {"homeId": "h-1"}), 없으면 기본 스트림
+    - ctx.telemetry_cache 가 있으면 (endpoint, 구간, scope) 단위로 변환된 frame 을 캐시
+    - 동시에 같은 구간을 요청하면 백엔드 호출은 1회만 수행 (single-flight)
+    """
+    endpoint = metrics_url
+    params = {"from": start_epoch, "toExclusive": end_epoch}
+    if scope:
+        params.update(scope)
+        endpoint = metrics_url + "?" + scope_key(scope)
+
+    cache = getattr(ctx, "telemetry_cache", None)
+    key = cache.make_key(endpoint, start_epoch, end_epoch) if cache else None
+
+    if cache:
+        cached = await cache.load(key)
+        if cached is not None:
+            return cached
+
+    async def _load() -> TelemetryFrame:
+        with span(ctx, "telemetry_fetch"):
+            body = await fetch_bytes(ctx, metrics_url, params)
+        with span(ctx, "telemetry_parse"):
+            frame = TelemetryFrame.from_json(body)
+        del body
+        if cache:
+            await cache.store(key, frame, window_end=end_epoch)
+        return frame
+
+    # 같은 구간을 조회 중인 요청이 있으면 그 결과를 함께 기다림
+    flight = getattr(ctx, "telemetry_flight", None)
+    if flight is None:
+        return await _load()
+    return await flight.do((endpoint, start_epoch, end_epoch), _load)
+
+
+async def load_series(
+    ctx, start_dt: datetime, end_dt: datetime, scope: Optional[Mapping[str, str]] = None
+) -> TelemetryFrame:
+    """
+    구간 telemetry
+    - ctx.telemetry_ingest 가 이 scope 를 수신 중이면 ring buffer 에서 (백엔드 조회 없음)
+      ring 이 구간 시작까지 덮지 못하면 [시작, covered_from) 만 백엔드 조회 (닫힌 구간이라 긴 TTL 로 캐시)
+    - 그 외에는 전체 구간 백엔드 조회
+    """
+    start_epoch, end_epoch = int(start_dt.timestamp()), int(end_dt.timestamp())
+    url = telemetry_url(ctx)
+
+    ingest = getattr(ctx, "telemetry_ingest", None)
+    if ingest is not None:
+        with span(ctx, "ingest_read"):
+            served = ingest.window(scope_key(scope), start_epoch, end_epoch)
+        if served is not None:
+            frame, covered_from = served
+            if covered_from > start_epoch:
+                head = await fetch_telemetry(ctx, url, start_epoch, covered_from, scope)
+                frame = TelemetryFrame.concat(head, frame)
+            return frame
+
+    return await fetch_telemetry(ctx, url, start_epoch, end_epoch, scope)
+
+
+# ------------------------
+# 요약 / 로컬 점수
+# ------------------------
+def evaluate_series(ctx, series: TelemetryFrame) -> dict:
+    """로컬 엔진으로 항목별 점수 / 초과 비율 계산 (엔진이 없으면 빈 dict)"""
+    engine = getattr(ctx, "scoring_engine", None)
+    if engine is None:
+        return {}
+    with span(ctx, "scoring"):
+        return engine.evaluate(series.values_by_metric())
+
+
+def daily_score_info(ctx, evaluation: dict) -> dict:
+    engine = getattr(ctx, "scoring_engine", None)
+    score = engine.daily_score(evaluation) if engine else None
+    return {
+        "aiDailyScore": score,
+        "grade": engine.grade(score) if score is not None else None,
+    }
+
+
+def parse_metrics(payload: dict, criteria: Optional[CompiledCriteria] = None, bucket: str = "hour") -> dict:
+    """
+    telemetry 응답을 프롬프트용 요약으로 변환
+    (원시 샘플 배열 대신 항목별 통계 / 버킷 / 기준 구간 비율)
+    """
+    return summarize_metrics(TelemetryFrame.from_payload(payload), criteria, bucket=bucket)
+
+
+def parse_device_status(items: Iterable[dict]) -> Dict[str, bool]:
+    summary: Dict[str, bool] = {}
+    for it in items or []:
+        try:
+            dev_type = str(it.get("type", "")).strip()
+            if not dev_type:
+                continue
+            key = dev_type.upper()
+            on = bool(it.get("on", False))
+            # 하나라도 True면 True
+            summary[key] = summary.get(key, False) or on
+        except Exception:
+            # 단일 항목 오류는 무시하고 계속
+            continue
+    return summary
+
+
+# ------------------------
+# 월간 요약 (일별 rollup)
+# ------------------------
+async def monthly_metrics(
+    ctx, start_dt: datetime, end_dt: datetime, scope: Optional[Mapping[str, str]] = None
+) -> dict:
+    """
+    월간 프롬프트용 요약 (summarize_metrics(bucket="day") 와 같은 형태)
+    - ctx.rollup_store 가 있으면 지난 날은 저장된 일별 rollup, 오늘은 원시 샘플만 조회
+    - 없으면 한 달치 원시 샘플을 조회해 요약
+    """
+    criteria = getattr(ctx, "criteria", None)
+    store = getattr(ctx, "rollup_store", None)
+    if store is None:
+        series = await load_series(ctx, start_dt, end_dt, scope)
+        with span(ctx, "summarize"):
+            return summarize_metrics(series, criteria, bucket="day")
+
+    today_start, _ = today_window()
+    days = []
+    day = start_dt
+    while day < end_dt and day <= today_start:
+        days.append(day)
+        day += timedelta(days=1)
+
+    rollups = await daily_rollups(ctx, store, days, scope)
+    with span(ctx, "summarize"):
+        labels = (_day_label(d) for d in days)
+        return summarize_rollups([(label, rollups[label]) for label in labels if label in rollups], criteria)
+
+
+async def daily_rollups(ctx, store, days: List[datetime], scope: Optional[Mapping[str, str]] = None) -> Dict[str, dict]:
+    """
+    날짜 라벨 → rollup
+    - 메모리 → 영구 저장소 순으로 조회
+    - 없는 날은 그날 구간만 조회해 계산, 끝난 지 settle_delay 가 지난 날만 저장 (오늘은 항상 새로 계산)
+    """
+    key = scope_key(scope)
+    labels = [_day_label(d) for d in days]
+
+    with span(ctx, "rollup_load"):
+        found = store.get_many(key, labels)
+        missing = [label for label in labels if label not in found]
+        if missing:
+            for label, rollup in (await asyncio.to_thread(store.load_many, key, missing)).items():
+                store.remember(key, label, rollup)
+                found[label] = rollup
+
+    criteria = getattr(ctx, "criteria", None)
+    semaphore = asyncio.Semaphore(ROLLUP_BACKFILL_CONCURRENCY)
+
+    async def _build(day: datetime) -> None:
+        label, day_end = _day_label(day), day + timedelta(days=1)
+        async with semaphore:
+            frame = await load_series(ctx, day, day_end, scope)
+        rollup = rollup_series(frame, criteria, store.sketch_size)
+        if day_end.timestamp() <= time.time() - store.settle_delay:
+            # 지난 달 rollup 은 더 이상 쓰이지 않으므로 이번 구간 첫날 이전은 정리
+            store.put(key, label, rollup, keep_from=labels[0])
+        found[label] = rollup
+
+    todo = [d for d in days if _day_label(d) not in found]
+    if todo:
+        with span(ctx, "rollup_backfill"):
+            await asyncio.gather(*(_build(d) for d in todo))
+    return found
+
+
+def _day_label(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%d")
+
+
+# ------------------------
+# 프롬프트 치환 값
+# ------------------------
+def daily_placeholders(ctx, series: TelemetryFrame, evaluation: dict) -> dict:
+    return {
+        "metrics": summarize_metrics(series, getattr(ctx, "criteria", None)),
+        "score": daily_score_info(ctx, evaluation),
+        # "deviceStatus": device_status
+    }
+
+
+def monthly_placeholders(ctx, metrics: dict, start_dt: datetime, end_dt: datetime) -> dict:
+    return {
+        # 1달치는 일 단위 버킷으로 요약 (monthly_metrics)
+        "metrics": metrics,
+        "time_range": {
+            "start": start_dt.strftime("%Y-%m-%d"),
+            "end": (end_dt - timedelta(days=1)).strftime("%Y-%m-%d")
+        }
+    }
+
+
+def tip_placeholders(ctx, series: TelemetryFrame) -> dict:
+    return {"metrics": summarize_metrics(series, getattr(ctx, "criteria", None))}
+
+
+# ------------------------
+# 리포트 생성
+# ------------------------
+async def build_daily_report(ctx, mode: str = "llm", scope: Optional[Mapping[str, str]] = None) -> dict:
+    start_dt, end_dt = today_window()
+    series = await load_series(ctx, start_dt, end_dt, scope)
+    evaluation = evaluate_series(ctx, series)
+
+    if mode == "fast":
+        return {"time": int(time.time()), "reports": ctx.scoring_engine.daily_report(evaluation)}
+
+    # # devices
+    # d_payload = await fetch_json(ctx, device_url)
+    # device_status = parse_device_status(d_payload)
+
+    with span(ctx, "summarize"):
+        placeholders = daily_placeholders(ctx, series, evaluation)
+    with span(ctx, "llm_generate"):
+        resp_text = await ctx.llm_manager.generate(
+            DAILY_REPORT_PROMPTS,
+            placeholders=placeholders,
+            temperature=LLM_TEMPERATURE
+        )
+    with span(ctx, "parse_reports"):
+        result = ctx.llm_manager.parse_reports(resp_text, "daily")
+    # 점수는 LLM 이 아닌 로컬 엔진 값 사용 (재현 가능)
+    result["reports"]["aiDailyScore"] = placeholders["score"]["aiDailyScore"]
+    return result
+
+
+async def build_monthly_report(ctx, mode: str = "llm", scope: Optional[Mapping[str, str]] = None) -> dict:
+    if mode == "fast":
+        raise ValueError("monthly report has no fast mode")
+    start_dt, end_dt = month_window()
+    metrics = await monthly_metrics(ctx, start_dt, end_dt, scope)
+
+    placeholders = monthly_placeholders(ctx, metrics, start_dt, end_dt)
+    with span(ctx, "llm_generate"):
+        resp_text = await ctx.llm_manager.generate(
+            MONTHLY_REPORT_PROMPTS,
+            placeholders=placeholders,
+            temperature=LLM_TEMPERATURE
+        )
+    with span(ctx, "parse_reports"):
+        return ctx.llm_manager.parse_reports(resp_text, "monthly")
+
+
+async def build_tip_report(ctx, mode: str = "llm", scope: Optional[Mapping[str, str]] = None) -> dict:
+    start_dt, end_dt = today_window()
+    series = await load_series(ctx, start_dt, end_dt, scope)
+
+    if mode == "fast":
+        categories = ctx.scoring_engine.recommend_categories(evaluate_series(ctx, series))
+        return {"time": int(time.time()), "reports": {"category": categories}}
+
+    with span(ctx, "summarize"):
+        placeholders = tip_placeholders(ctx, series)
+    with span(ctx, "llm_generate"):
+        resp_text = await ctx.llm_manager.generate(
+            TIP_REPORT_PROMPTS,
+            placeholders=placeholders,
+            temperature=LLM_TEMPERATURE
+        )
+    with span(ctx, "parse_reports"):
+        return ctx.llm_manager.parse_reports(resp_text, "tip")
+
+
+# kind → (생성 함수, 조회 구간)
+REPORT_KINDS: Dict[str, Tuple[Callable[..., Awaitable[dict]], Callable[[], Tuple[datetime, datetime]]]] = {
+    "daily": (build_daily_report, today_window),
+    "monthly": (build_monthly_report, month_window),
+    "tip": (build_tip_report, today_window),
+}
+
+
+# ------------------------
+# 사전 계산 리포트
+# ------------------------
+def report_key(kind: str) -> Tuple[str, int]:
+    """(저장 키, 구간 종료 epoch) - 구간 시작 시각이 키에 포함되므로 날/달이 바뀌면 자동으로 miss"""
+    _, window = REPORT_KINDS[kind]
+    start_dt, end_dt = window()
+    return f"{kind}:{int(start_dt.timestamp())}", int(end_dt.timestamp())
+
+
+async def refresh_report(ctx, kind: str) -> dict:
+    """리포트를 새로 생성해 저장소에 기록 (응답이 스키마 위반이면 LLMResponseFormatError, 기존 값 유지)"""
+    builder, _ = REPORT_KINDS[kind]
+    key, window_end = report_key(kind)
+
+    value = await builder(ctx)
+    store = getattr(ctx, "report_store", None)
+    if store is not None and value.get("reports"):
+        store.put(key, value, window_end)
+    return value
+
+
+async def get_report(ctx, kind: str) -> dict:
+    """
+    저장된 리포트가 max_staleness 이내면 O(1) 반환, 아니면 즉시 생성
+    - 메모리 → 영구 저장소 순으로 조회 (스케줄러를 돌리지 않는 워커는 다른 워커가 기록한 리포트 사용)
+    """
+    store = getattr(ctx, "report_store", None)
+    if store is not None:
+        key, _ = report_key(kind)
+        stored = store.get_fresh(key)
+        if stored is None:
+            loaded = await asyncio.to_thread(store.load, key)
+            if loaded is not None:
+                store.remember(key, loaded)
+                stored = store.fresh(loaded)
+        if stored is not None:
+            return stored.value
+
+    return await refresh_report(ctx, kind)
@@ -0,0 +1,189 @@
+# service/ai/report_store.py
+#
+# 사전 계산된 리포트 저장소
+# - MemoryReportStore: dict 기반, O(1) 조회
+# - SQLiteReportStore: 메모리 dict 를 그대로 쓰고 SQLite 에 write-through → 재시작 후 복원
+#   메모리에 새 리포트가 없으면 load (쓰레드에서 호출) 로 파일 조회 → 다른 워커가 만든 리포트도 사용
+#   기록은 전용 쓰레드 1개에서 순서대로 처리, close() 는 남은 기록을 모두 끝낸 뒤 연결을 닫음
+# - lease: 워커 여러 개 중 하나만 스케줄러를 돌리도록 (SQLite 행 하나를 만료 시각과 함께 선점)
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, NamedTuple, Optional
+
+import orjson
+
+from common.sqlite_store import connect_shared
+
+
+class StoredReport(NamedTuple):
+    value: Any
+    generated_at: float
+    window_end: int
+
+
+class MemoryReportStore:
+    backend = "memory"
+
+    def __init__(self, max_staleness: float = 900.0):
+        self.max_staleness = max_staleness
+        self._items: Dict[str, StoredReport] = {}
+
+    def get(self, key: str) -> Optional[StoredReport]:
+        return self._items.get(key)
+
+    def get_fresh(self, key: str, max_age: Optional[float] = None) -> Optional[StoredReport]:
+        return self.fresh(self._items.get(key), max_age)
+
+    def fresh(self, item: Optional[StoredReport], max_age: Optional[float] = None) -> Optional[StoredReport]:
+        if item is None:
+            return None
+
+        max_age = self.max_staleness if max_age is None else max_age
+        if time.time() - item.generated_at > max_age:
+            return None
+        return item
+
+    def load(self, key: str) -> Optional[StoredReport]:
+        """영구 저장소 조회 (메모리 저장소는 없음)"""
+        return None
+
+    def remember(self, key: str, item: StoredReport) -> None:
+        """영구 저장소에서 읽어 온 리포트를 메모리에만 기록 (더 최근 것만)"""
+        current = self._items.get(key)
+        if current is None or current.generated_at < item.generated_at:
+            self._items[key] = item
+
+    def put(self, key: str, value: Any, window_end: int) -> StoredReport:
+        item = StoredReport(value, time.time(), int(window_end))
+        self._items[key] = item
+        self.purge_expired()
+        return item
+
+    def purge_expired(self, keep_seconds: float = 86400.0) -> None:
+        """구간이 끝난 지 하루 이상 지난 리포트 정리"""
+        limit = time.time() - keep_seconds
+        for key in [k for k, v in self._items.items() if v.window_end < limit]:
+            del self._items[key]
+
+    def keys(self):
+        return list(self._items)
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """프로세스 하나만 쓰는 저장소이므로 항상 성공"""
+        return True
+
+    def release_lease(self, name: str, owner: str) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteReportStore(MemoryReportStore):
+    backend = "sqlite"
+
+    def __init__(self, path: str, max_staleness: float = 900.0):
+        super().__init__(max_staleness)
+        self.path = path
+        self._lock = threading.Lock()
+        # 디스크 기록은 이벤트 루프 밖, 순서대로 (close() 에서 남은 기록까지 처리 후 종료)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-store")
+        self.write_errors = 0
+
+        # 워커 여러 개가 같은 파일을 쓸 수 있으므로 WAL + busy timeout
+        self._conn = connect_shared(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS reports ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " generated_at REAL NOT NULL,"
+            " window_end INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS leases ("
+            " name TEXT PRIMARY KEY,"
+            " owner TEXT NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._load()
+
+    def _load(self) -> None:
+        rows = self._conn.execute("SELECT key, value, generated_at, window_end FROM reports").fetchall()
+        for key, value, generated_at, window_end in rows:
+            self._items[key] = StoredReport(orjson.loads(value), generated_at, window_end)
+        super().purge_expired()
+
+    def load(self, key: str) -> Optional[StoredReport]:
+        # 쓰레드에서 호출됨 (asyncio.to_thread) → 메모리 dict 는 건드리지 않음
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, generated_at, window_end FROM reports WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, generated_at, window_end = row
+        return StoredReport(orjson.loads(value), generated_at, window_end)
+
+    def put(self, key: str, value: Any, window_end: int) -> StoredReport:
+        item = super().put(key, value, window_end)
+        blob = orjson.dumps(value)
+        self._writer.submit(self._write, key, blob, item).add_done_callback(self._written)
+        return item
+
+    def _write(self, key: str, blob: bytes, item: StoredReport) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reports (key, value, generated_at, window_end) VALUES (?, ?, ?, ?)",
+                (key, blob, item.generated_at, item.window_end),
+            )
+            self._conn.execute(
+                "DELETE FROM reports WHERE window_end < ?", (time.time() - 86400.0,)
+            )
+            self._conn.commit()
+
+    def _written(self, future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            # 메모리에는 남아 있으므로 이 워커는 계속 사용 (재시작 / 다른 워커만 못 봄)
+            self.write_errors += 1
+            print(f"!! report store write failed: {error}")
+
+    # ------------------------
+    # 스케줄러 lease
+    # ------------------------
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """비어 있거나 만료됐거나 이미 owner 가 가진 lease 면 ttl 만큼 (재)선점 - 쓰레드에서 호출"""
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)"
+                " ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at"
+                " WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+                (name, owner, now + ttl, now),
+            )
+            self._conn.commit()
+            return cur.rowcount > 0
+
+    def release_lease(self, name: str, owner: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+            self._conn.commit()
+
+    def close(self) -> None:
+        # 남은 기록을 모두 끝낸 뒤 연결 종료 (블로킹 → 호출 측에서 asyncio.to_thread)
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
+
+
+def create_report_store(backend: str, path: Optional[str] = None, max_staleness: float = 900.0) -> MemoryReportStore:
+    if backend == "memory":
+        return MemoryReportStore(max_staleness)
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("sqlite report store requires a path")
+        return SQLiteReportStore(path, max_staleness)
+    raise ValueError(f"Unsupported report store backend: {backend}")
@@ -0,0 +1,138 @@
+# service/ai/rollup_store.py
+#
+# 일별 telemetry rollup 저장소 (metrics_aggregator.rollup_series 결과)
+# - 키: (scope, 날짜 "YYYY-MM-DD"), 값: 항목별 집계 dict
+# - version: 구간 기준(analysis_criteria) / sketch 크기가 바뀌면 기존 rollup 은 무시하고 다시 계산
+# - settle_delay: 날이 끝나고 이 시간(초)이 지나야 저장 (늦게 들어오는 샘플 반영)
+# - MemoryRollupStore: dict 기반
+# - SQLiteRollupStore: 메모리 dict + SQLite write-through
+#   메모리에 없는 날은 load_many (쓰레드에서 호출) 로 파일 조회 → 다른 워커가 기록한 날도 재사용
+#   기록은 전용 쓰레드 1개에서 순서대로 처리, close() 는 남은 기록을 모두 끝낸 뒤 연결을 닫음
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+import orjson
+
+from common.sqlite_store import connect_shared
+
+
+class MemoryRollupStore:
+    backend = "memory"
+
+    def __init__(self, version: str = "", sketch_size: int = 101, settle_delay: float = 600.0):
+        self.version = version
+        self.sketch_size = sketch_size
+        self.settle_delay = settle_delay
+        self._items: Dict[Tuple[str, str], dict] = {}
+
+    def get_many(self, scope: str, days: Iterable[str]) -> Dict[str, dict]:
+        """메모리에 있는 rollup 만 반환"""
+        found = {}
+        for day in days:
+            rollup = self._items.get((scope, day))
+            if rollup is not None:
+                found[day] = rollup
+        return found
+
+    def load_many(self, scope: str, days: Iterable[str]) -> Dict[str, dict]:
+        """영구 저장소 조회 (메모리 저장소는 없음)"""
+        return {}
+
+    def remember(self, scope: str, day: str, rollup: dict) -> None:
+        """영구 저장소에서 읽어 온 rollup 을 메모리에만 기록"""
+        self._items[(scope, day)] = rollup
+
+    def put(self, scope: str, day: str, rollup: dict, keep_from: Optional[str] = None) -> None:
+        """keep_from 이 있으면 그보다 이전 날짜의 rollup 정리 (월간 요약에 더 이상 쓰이지 않음)"""
+        self._items[(scope, day)] = rollup
+        if keep_from is not None:
+            for key in [k for k in self._items if k[1] < keep_from]:
+                del self._items[key]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteRollupStore(MemoryRollupStore):
+    backend = "sqlite"
+
+    def __init__(self, path: str, version: str = "", sketch_size: int = 101, settle_delay: float = 600.0):
+        super().__init__(version, sketch_size, settle_delay)
+        self.path = path
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rollup-store")
+        self.write_errors = 0
+
+        self._conn = connect_shared(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS daily_rollups ("
+            " scope TEXT NOT NULL,"
+            " day TEXT NOT NULL,"
+            " version TEXT NOT NULL,"
+            " value BLOB NOT NULL,"
+            " PRIMARY KEY (scope, day))"
+        )
+        self._conn.commit()
+
+    def load_many(self, scope: str, days: Iterable[str]) -> Dict[str, dict]:
+        # 쓰레드에서 호출됨 (asyncio.to_thread) → 메모리 dict 는 건드리지 않음
+        days = list(days)
+        if not days:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT day, value FROM daily_rollups WHERE scope = ? AND version = ?"
+                f" AND day IN ({','.join('?' * len(days))})",
+                (scope, self.version, *days),
+            ).fetchall()
+        return {day: orjson.loads(value) for day, value in rows}
+
+    def put(self, scope: str, day: str, rollup: dict, keep_from: Optional[str] = None) -> None:
+        super().put(scope, day, rollup, keep_from)
+        blob = orjson.dumps(rollup)
+        # 디스크 기록은 이벤트 루프 밖에서
+        self._writer.submit(self._write, scope, day, blob, keep_from).add_done_callback(self._written)
+
+    def _write(self, scope: str, day: str, blob: bytes, keep_from: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO daily_rollups (scope, day, version, value) VALUES (?, ?, ?, ?)",
+                (scope, day, self.version, blob),
+            )
+            if keep_from is not None:
+                self._conn.execute("DELETE FROM daily_rollups WHERE day < ?", (keep_from,))
+            self._conn.commit()
+
+    def _written(self, future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            # 메모리에는 남아 있으므로 다음에 다시 계산될 때까지 이 워커는 계속 사용
+            self.write_errors += 1
+            print(f"!! rollup store write failed: {error}")
+
+    def close(self) -> None:
+        # 남은 기록을 모두 끝낸 뒤 연결 종료 (블로킹 → 호출 측에서 asyncio.to_thread)
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
+
+
+def create_rollup_store(
+    backend: str,
+    path: Optional[str] = None,
+    version: str = "",
+    sketch_size: int = 101,
+    settle_delay: float = 600.0,
+) -> MemoryRollupStore:
+    if backend == "memory":
+        return MemoryRollupStore(version, sketch_size, settle_delay)
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("sqlite rollup store requires a path")
+        return SQLiteRollupStore(path, version, sketch_size, settle_delay)
+    raise ValueError(f"Unsupported rollup store backend: {backend}")
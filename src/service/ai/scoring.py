@@ -0,0 +1,165 @@
+# service/ai/scoring.py
+#
+# analysis_criteria 기반 로컬 점수 / 카테고리 추천 엔진
+# - aiDailyScore: 샘플별 구간 점수의 평균 → 항목 평균 (재현 가능, LLM 불필요)
+# - 생활 카테고리: 항목별 초과 비율로 규칙 가중치를 합산해 상위 3개 선택
+# - fast 모드용 요약 문장도 규칙 기반으로 생성
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from service.ai.criteria import CompiledCriteria, MetricBands
+
+# 구간별 점수 (aiDailyScore 등급표와 맞춤)
+LEVEL_SCORES = {
+    "very_good": 100.0,
+    "good": 85.0,
+    "normal": 62.0,
+    "bad": 47.0,
+    "very_bad": 20.0,
+}
+
+# aiDailyScore 등급 (하한, 라벨)
+SCORE_GRADES = (
+    (90, "매우 좋음"),
+    (80, "좋음"),
+    (70, "적절"),
+    (55, "보통"),
+    (40, "나쁨"),
+    (0, "매우 나쁨"),
+)
+
+CATEGORIES = (
+    "주방 청소하기",
+    "욕실 청소하기",
+    "방 청소하기",
+    "옷장 정리하기",
+    "책상 정리하기",
+    "창문 청소하기",
+    "바닥 청소하기",
+    "침구 관리하기",
+    "기타 청소 팁",
+)
+
+# 조건이 뚜렷하지 않을 때 채울 기본 조합
+DEFAULT_CATEGORIES = ("방 청소하기", "바닥 청소하기", "주방 청소하기")
+
+# (항목, 방향) → 추천 카테고리 (앞쪽일수록 가중치 큼)
+CATEGORY_RULES: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    ("dust", "high"): ("창문 청소하기", "바닥 청소하기", "침구 관리하기"),
+    ("humi", "high"): ("욕실 청소하기", "침구 관리하기", "기타 청소 팁"),
+    ("humi", "low"): ("침구 관리하기", "방 청소하기"),
+    ("co2", "high"): ("책상 정리하기", "방 청소하기"),
+    ("tvoc", "high"): ("옷장 정리하기", "기타 청소 팁"),
+    ("temp", "low"): ("침구 관리하기", "욕실 청소하기"),
+    ("temp", "high"): ("침구 관리하기", "주방 청소하기"),
+}
+
+# fast 모드 문장 (항목, 방향)
+ADVICE = {
+    ("dust", "high"): "미세먼지가 높아 공기청정기 가동과 물걸레 청소가 필요합니다.",
+    ("co2", "high"): "이산화탄소가 높아 주기적인 환기가 필요합니다.",
+    ("tvoc", "high"): "휘발성유기화합물이 높아 환기와 발생원 점검이 필요합니다.",
+    ("temp", "high"): "실내 온도가 높아 냉방이나 환기로 온도를 낮추세요.",
+    ("temp", "low"): "실내 온도가 낮아 난방으로 적정 온도를 유지하세요.",
+    ("humi", "high"): "습도가 높아 제습과 환기로 곰팡이를 예방하세요.",
+    ("humi", "low"): "습도가 낮아 가습기로 적정 습도를 유지하세요.",
+}
+
+# 나쁨 이상 비율이 이 값을 넘으면 "문제 있음" 으로 판단
+PROBLEM_THRESHOLD = 0.2
+
+
+class _CompiledMetric:
+    def __init__(self, bands: MetricBands):
+        self.bands = bands
+        self.level_scores = np.array([LEVEL_SCORES.get(l, 0.0) for l in bands.levels])
+        self.bad_mask = np.array([l in ("bad", "very_bad") for l in bands.levels])
+        # 최적 구간의 경계 → 초과/미달 방향 판정
+        self.best_lo = float(bands.lo[0])
+        self.best_hi = float(bands.hi[0])
+
+
+class ScoringEngine:
+    def __init__(self, criteria: CompiledCriteria):
+        self.metrics = {name: _CompiledMetric(b) for name, b in criteria.metrics.items()}
+
+    def evaluate(self, values: Dict[str, np.ndarray]) -> Dict[str, dict]:
+        """
+        항목별 점수와 나쁨 이상 비율(방향별) 계산
+        {"co2": {"score": 71.3, "high": 0.25, "low": 0.0}, ...}
+        """
+        result: Dict[str, dict] = {}
+        for name, v in values.items():
+            m = self.metrics.get(name)
+            v = np.asarray(v, dtype=np.float64)
+            if m is None or len(v) == 0:
+                continue
+
+            idx = m.bands.classify(v)
+            bad = m.bad_mask[idx]
+            result[name] = {
+                "score": float(m.level_scores[idx].mean()),
+                "high": float((bad & (v >= m.best_hi)).mean()),
+                "low": float((bad & (v < m.best_lo)).mean()),
+            }
+        return result
+
+    @staticmethod
+    def daily_score(evaluation: Dict[str, dict]) -> Optional[int]:
+        if not evaluation:
+            return None
+        return int(round(sum(e["score"] for e in evaluation.values()) / len(evaluation)))
+
+    @staticmethod
+    def grade(score: int) -> str:
+        for floor, label in SCORE_GRADES:
+            if score >= floor:
+                return label
+        return SCORE_GRADES[-1][1]
+
+    @staticmethod
+    def problems(evaluation: Dict[str, dict]) -> List[Tuple[str, str, float]]:
+        """(항목, 방향, 비율) 을 심각한 순으로"""
+        found = []
+        for name, e in evaluation.items():
+            for direction in ("high", "low"):
+                if e[direction] >= PROBLEM_THRESHOLD:
+                    found.append((name, direction, e[direction]))
+        found.sort(key=lambda p: p[2], reverse=True)
+        return found
+
+    def recommend_categories(self, evaluation: Dict[str, dict], k: int = 3) -> List[str]:
+        weights: Dict[str, float] = {}
+        for name, direction, ratio in self.problems(evaluation):
+            for rank, category in enumerate(CATEGORY_RULES.get((name, direction), ())):
+                weights[category] = weights.get(category, 0.0) + ratio / (rank + 1)
+
+        picked = sorted(weights, key=lambda c: (-weights[c], CATEGORIES.index(c)))[:k]
+        for category in DEFAULT_CATEGORIES:
+            if len(picked) >= k:
+                break
+            if category not in picked:
+                picked.append(category)
+        return picked
+
+    def daily_report(self, evaluation: Dict[str, dict]) -> dict:
+        """fast 모드: LLM 없이 규칙 기반 일일 리포트"""
+        score = self.daily_score(evaluation)
+        problems = self.problems(evaluation)
+
+        advice = [ADVICE[(n, d)] for n, d, _ in problems if (n, d) in ADVICE]
+        analysis = advice[:3]
+        if advice:
+            summary = advice[0]
+        elif score is not None:
+            summary = f"실내 환경이 전반적으로 {self.grade(score)} 상태입니다."
+        else:
+            summary = "수집된 환경 데이터가 없습니다."
+
+        return {
+            "aiDailyReport": summary,
+            "aiAnalysis": analysis,
+            "aiDailyScore": score,
+        }
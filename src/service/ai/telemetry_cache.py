@@ -0,0 +1,117 @@
+# service/ai/telemetry_cache.py
+#
+# /telemetry/range 조회 결과 캐시
+# - 키: (endpoint, from, toExclusive) → 일/월 단위로 잘린 구간이라 그대로 시간 버킷 역할을 함
+# - 아직 열려 있는 구간(오늘, 이번 달)은 짧은 TTL, 이미 닫힌 구간은 긴 TTL
+# - maxsize 초과 시 LRU 순으로 제거
+# - (선택) shared: 워커 간 공유 SQLite 2차 캐시 → 다른 워커가 이미 받아 둔 구간은 백엔드 호출 생략
+#   저장 형식은 encode / decode 로 지정 (기본 orjson, report_service 는 TelemetryFrame 바이너리)
+
+import asyncio
+import time
+from typing import Any, Callable, Hashable, NamedTuple, Optional, Tuple
+
+import orjson
+from cachetools import TLRUCache
+
+from common.sqlite_store import SQLiteTTLStore
+
+
+class _Entry(NamedTuple):
+    payload: Any
+    window_end: int     # toExclusive (epoch seconds)
+
+
+class TelemetryCache:
+    def __init__(
+        self,
+        maxsize: int = 256,
+        open_window_ttl: float = 60.0,
+        closed_window_ttl: float = 86400.0,
+        timer=time.time,
+        shared: Optional[SQLiteTTLStore] = None,
+        encode: Callable[[Any], bytes] = orjson.dumps,
+        decode: Callable[[bytes], Any] = orjson.loads,
+    ):
+        self.open_window_ttl = open_window_ttl
+        self.closed_window_ttl = closed_window_ttl
+        self._timer = timer
+        # 구간 종료 시각과 비교해야 하므로 monotonic 이 아닌 wall clock 사용
+        self._cache = TLRUCache(maxsize=maxsize, ttu=self._ttu, timer=timer)
+        self._shared = shared
+        self._encode = encode
+        self._decode = decode
+
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(endpoint: str, start_epoch: int, end_epoch: int) -> Tuple[str, int, int]:
+        return (endpoint, int(start_epoch), int(end_epoch))
+
+    def _ttu(self, key: Hashable, entry: _Entry, now: float) -> float:
+        if entry.window_end <= now:
+            # 닫힌 구간: 데이터가 더 바뀌지 않음
+            return now + self.closed_window_ttl
+
+        # 열린 구간: 짧게 유지하되 구간이 닫히는 시점은 넘기지 않음
+        return min(now + self.open_window_ttl, entry.window_end)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry.payload
+
+    def set(self, key: Hashable, payload: Any, window_end: int) -> None:
+        self._cache[key] = _Entry(payload, int(window_end))
+
+    async def load(self, key: Tuple[str, int, int]) -> Optional[Any]:
+        """메모리 → 공유 캐시 순으로 조회 (공유 캐시 적중 시 메모리에도 저장)"""
+        entry = self._cache.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry.payload
+
+        if self._shared is not None:
+            blob = await asyncio.to_thread(self._shared.get, self._shared_key(key))
+            if blob is not None:
+                payload = self._decode(blob)
+                self.hits += 1
+                self.shared_hits += 1
+                self.set(key, payload, window_end=key[2])
+                return payload
+
+        self.misses += 1
+        return None
+
+    async def store(self, key: Tuple[str, int, int], payload: Any, window_end: int) -> None:
+        self.set(key, payload, window_end)
+        if self._shared is not None:
+            now = self._timer()
+            expires_at = self._ttu(key, _Entry(payload, int(window_end)), now)
+            await asyncio.to_thread(self._shared.set, self._shared_key(key), self._encode(payload), expires_at)
+
+    @staticmethod
+    def _shared_key(key: Tuple[str, int, int]) -> str:
+        return "|".join(str(part) for part in key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def close(self) -> None:
+        if self._shared is not None:
+            self._shared.close()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._cache),
+            "maxsize": self._cache.maxsize,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+        }
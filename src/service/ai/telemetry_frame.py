@@ -0,0 +1,132 @@
+# service/ai/telemetry_frame.py
+#
+# /telemetry/range 응답 → 항목별 열(column) 배열
+# - 응답 본문(bytes)을 orjson 으로 1회 디코딩한 직후 항목별 numpy 배열로 옮기고 dict 트리는 버림
+#   (캐시에는 포인트마다 dict 를 가진 원본 대신 항목당 배열 2개만 남음)
+# - Mapping[str, Series] 로 동작하므로 summarize_metrics / 점수 엔진에 그대로 전달
+# - to_bytes / from_bytes: 워커 간 공유 캐시용 바이너리 (JSON 재파싱 없이 버퍼에서 바로 복원)
+
+import struct
+from operator import itemgetter
+from typing import Dict, Iterator, Mapping, Optional
+
+import numpy as np
+import orjson
+
+from service.ai.metrics_aggregator import METRIC_KEYS, TIMESTAMP_KEYS, Series
+
+_HEADER_LEN = struct.Struct("<I")
+_get_value = itemgetter("value")
+
+
+class TelemetryFrame(Mapping):
+    __slots__ = ("_columns",)
+
+    def __init__(self, columns: Dict[str, Series]):
+        self._columns = columns
+
+    # ------------------------
+    # 생성
+    # ------------------------
+    @classmethod
+    def from_json(cls, body: bytes) -> "TelemetryFrame":
+        return cls.from_payload(orjson.loads(body) if body else None)
+
+    @classmethod
+    def from_payload(cls, payload: Optional[dict]) -> "TelemetryFrame":
+        raw_series = (payload or {}).get("series", {}) or {}
+        columns: Dict[str, Series] = {}
+
+        for key in METRIC_KEYS:
+            points = raw_series.get(key, []) or []
+            n = len(points)
+            values = np.fromiter(map(_get_value, points), dtype=np.float64, count=n)
+
+            ts = None
+            ts_key = _find_timestamp_key(points)
+            if ts_key is not None:
+                ts = np.fromiter(map(itemgetter(ts_key), points), dtype=np.float64, count=n)
+                if n and ts.max() > 1e11:     # epoch milliseconds
+                    ts /= 1000.0
+
+            columns[key] = (ts, values)
+
+        return cls(columns)
+
+    @classmethod
+    def concat(cls, *frames: "TelemetryFrame") -> "TelemetryFrame":
+        """시간 순으로 이어지는 frame 들을 항목별로 이어 붙임 (HTTP 앞부분 + ring buffer)"""
+        columns: Dict[str, Series] = {}
+        for key in dict.fromkeys(k for frame in frames for k in frame):
+            parts = [frame[key] for frame in frames if key in frame and len(frame[key][1])]
+            if not parts:
+                columns[key] = (None, np.empty(0, dtype=np.float64))
+                continue
+
+            values = np.concatenate([v for _, v in parts])
+            # 시각이 없는 조각이 하나라도 있으면 시각 없이 (버킷 요약 생략)
+            ts = None if any(t is None for t, _ in parts) else np.concatenate([t for t, _ in parts])
+            columns[key] = (ts, values)
+        return cls(columns)
+
+    # ------------------------
+    # Mapping
+    # ------------------------
+    def __getitem__(self, key: str) -> Series:
+        return self._columns[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def values_by_metric(self) -> Dict[str, np.ndarray]:
+        return {key: values for key, (_, values) in self._columns.items()}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(v.nbytes + (ts.nbytes if ts is not None else 0) for ts, v in self._columns.values())
+
+    # ------------------------
+    # 직렬화
+    # ------------------------
+    def to_bytes(self) -> bytes:
+        """[헤더 길이][헤더 JSON: 항목, 개수, 시각 유무][float64 버퍼...]"""
+        header = []
+        buffers = []
+        for key, (ts, values) in self._columns.items():
+            header.append([key, len(values), ts is not None])
+            if ts is not None:
+                buffers.append(ts.tobytes())
+            buffers.append(values.tobytes())
+
+        head = orjson.dumps(header)
+        return b"".join([_HEADER_LEN.pack(len(head)), head, *buffers])
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "TelemetryFrame":
+        (head_len,) = _HEADER_LEN.unpack_from(blob)
+        offset = _HEADER_LEN.size + head_len
+        header = orjson.loads(blob[_HEADER_LEN.size:offset])
+
+        columns: Dict[str, Series] = {}
+        for key, n, has_ts in header:
+            ts = None
+            if has_ts:
+                ts = np.frombuffer(blob, dtype=np.float64, count=n, offset=offset).copy()
+                offset += n * 8
+            values = np.frombuffer(blob, dtype=np.float64, count=n, offset=offset).copy()
+            offset += n * 8
+            columns[key] = (ts, values)
+        return cls(columns)
+
+
+def _find_timestamp_key(points) -> Optional[str]:
+    if not points:
+        return None
+    first = points[0]
+    for key in TIMESTAMP_KEYS:
+        if isinstance(first.get(key), (int, float)):
+            return key
+    return None
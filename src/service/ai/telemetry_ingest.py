@@ -0,0 +1,262 @@
+# service/ai/telemetry_ingest.py
+#
+# push 방식 telemetry 수신 → 기기(scope)별 고정 크기 ring buffer
+# - source (telemetry_sources: MQTT / AMQP / fake) 가 받은 메시지를 scope 별 ring 에 적재
+#   scope: topic 템플릿의 {homeId} / {deviceId} 값 + 메시지 본문의 homeId / deviceId
+# - report_service.load_series 는 ring 이 덮는 구간을 백엔드 조회 없이 TelemetryFrame 으로 받음
+#   ring 이 구간 시작까지 덮지 못하면 (기동 직후 / 재연결 / 오래된 샘플을 덮어씀) 앞부분만 HTTP 조회
+# - covered_from: 이 시각 이후 샘플은 빠짐없이 ring 에 있음
+#   COVERAGE_STEP 단위로 올림 → HTTP 로 받는 앞부분 구간 (캐시 키) 이 샘플마다 바뀌지 않음
+# - 메시지 본문 (JSON): {"ts": epoch 초|ms, "deviceId": ..., "dust": 12.0, "co2": 600, ...}
+#   항목은 최상위 / "metrics" / "values" 아래 숫자 또는 {"value": n}, 배열이면 샘플 여러 개
+# - 콜백 / 조회 모두 이벤트 루프 쓰레드에서만 호출되므로 lock 없음
+
+import asyncio
+import math
+import time
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import orjson
+
+from service.ai.metrics_aggregator import METRIC_KEYS, TIMESTAMP_KEYS
+from service.ai.telemetry_frame import TelemetryFrame
+from service.ai.telemetry_sources import TopicTemplate
+
+SCOPE_FIELDS = ("homeId", "deviceId")
+COVERAGE_STEP = 300         # covered_from 정렬 단위 (초)
+
+
+def scope_key(scope: Optional[Mapping[str, str]]) -> str:
+    """scope dict → 정렬된 query string (rollup / ring 공용 키, 기본 스트림은 "")"""
+    return "&".join(f"{k}={v}" for k, v in sorted(scope.items())) if scope else ""
+
+
+def _align(ts: float) -> int:
+    return int(math.ceil(ts / COVERAGE_STEP) * COVERAGE_STEP)
+
+
+class DeviceRing:
+    """시각 + 항목별 값 (없는 항목은 NaN) 을 capacity 개까지 보관, 가득 차면 가장 오래 전에 쓴 칸부터 덮어씀"""
+
+    __slots__ = ("capacity", "covered_from", "_ts", "_values", "_next", "_count")
+
+    def __init__(self, capacity: int, covered_from: int):
+        self.capacity = capacity
+        self.covered_from = covered_from
+        self._ts = np.zeros(capacity, dtype=np.float64)
+        self._values = np.full((capacity, len(METRIC_KEYS)), np.nan, dtype=np.float64)
+        self._next = 0
+        self._count = 0
+
+    def append(self, ts: float, row: np.ndarray) -> None:
+        i = self._next
+        if self._count == self.capacity:
+            # 덮어쓰는 샘플 시각까지는 더 이상 완전하지 않음
+            self.covered_from = max(self.covered_from, _align(self._ts[i] + 1))
+        else:
+            self._count += 1
+        self._ts[i] = ts
+        self._values[i] = row
+        self._next = (i + 1) % self.capacity
+
+    def frame(self, start: float, end: float) -> TelemetryFrame:
+        n = self._count
+        ts = self._ts[:n]
+        idx = np.flatnonzero((ts >= start) & (ts < end))
+        idx = idx[np.argsort(ts[idx], kind="stable")]     # 도착 순서가 아닌 시각 순
+        sel_ts, sel = ts[idx], self._values[idx]
+
+        columns = {}
+        for j, key in enumerate(METRIC_KEYS):
+            values = sel[:, j]
+            keep = ~np.isnan(values)
+            columns[key] = (sel_ts[keep], values[keep])
+        return TelemetryFrame(columns)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return self._ts.nbytes + self._values.nbytes
+
+
+class TelemetryIngestor:
+    def __init__(
+        self,
+        source,
+        template: TopicTemplate,
+        capacity: int = 4096,
+        max_devices: int = 256,
+        log=None,
+        timer=time.time,
+        retry_base: float = 1.0,
+        retry_max: float = 60.0,
+    ):
+        self.source = source
+        self.template = template
+        self.capacity = capacity
+        self.max_devices = max_devices
+        self.log = log
+        self._timer = timer
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+        self.rings: Dict[str, DeviceRing] = {}
+        self.connected = False
+        self.covered_from: Optional[int] = None     # 마지막 (재)연결 시각 기준
+        self._task: Optional[asyncio.Task] = None
+
+        self.messages = 0
+        self.readings = 0
+        self.rejected = 0
+        self.reconnects = 0
+        self.windows = {"ring": 0, "partial": 0, "fallback": 0}
+
+    # ------------------------
+    # 수명 주기
+    # ------------------------
+    def start(self) -> None:
+        """broker 연결은 백그라운드에서 (실패 시 backoff 재시도, 그동안은 HTTP 조회)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._connect(), name="telemetry-ingest")
+
+    async def _connect(self) -> None:
+        delay = self.retry_base
+        while True:
+            try:
+                await self.source.start(self._on_message, self._on_connect, self._on_disconnect)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.log:
+                    self.log.warning(f"[INGEST] {self.source.transport} connect failed: {e}; retry in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.retry_max)
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.connected = False
+        await self.source.stop()
+
+    # ------------------------
+    # source 콜백
+    # ------------------------
+    def _on_connect(self) -> None:
+        # 끊겨 있던 동안의 샘플은 받지 못했으므로 지금 이후부터 완전한 구간
+        covered_from = _align(self._timer())
+        if self.covered_from is not None:
+            self.reconnects += 1
+        self.covered_from = covered_from
+        for ring in self.rings.values():
+            ring.covered_from = max(ring.covered_from, covered_from)
+        self.connected = True
+        if self.log:
+            self.log.info(f"[INGEST] subscribed to '{self.template.pattern}' ({self.source.transport}), "
+                          f"complete from {covered_from}")
+
+    def _on_disconnect(self) -> None:
+        if self.connected and self.log:
+            self.log.warning(f"[INGEST] {self.source.transport} connection lost; falling back to backend")
+        self.connected = False
+
+    def _on_message(self, topic: str, payload: bytes) -> None:
+        try:
+            data = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            self.rejected += 1
+            return
+
+        self.messages += 1
+        ids = self.template.match(topic) or {}
+        now = self._timer()
+        for item in data if isinstance(data, list) else (data,):
+            if not isinstance(item, dict):
+                self.rejected += 1
+                continue
+
+            row = _metric_row(item)
+            ring = self._ring(item, ids) if row is not None else None
+            if ring is None:
+                self.rejected += 1
+                continue
+            ring.append(_timestamp(item, now), row)
+            self.readings += 1
+
+    def _ring(self, item: dict, ids: Dict[str, str]) -> Optional[DeviceRing]:
+        scope = {}
+        for field in SCOPE_FIELDS:
+            value = item.get(field) or ids.get(field)
+            if value:
+                scope[field] = str(value)
+
+        key = scope_key(scope)
+        ring = self.rings.get(key)
+        if ring is None:
+            if len(self.rings) >= self.max_devices:
+                return None
+            ring = self.rings[key] = DeviceRing(self.capacity, self.covered_from or _align(self._timer()))
+        return ring
+
+    # ------------------------
+    # 조회
+    # ------------------------
+    def window(self, key: str, start: int, end: int) -> Optional[Tuple[TelemetryFrame, int]]:
+        """
+        (ring 에서 만든 frame, 그 frame 이 덮는 시작 시각)
+        - 연결이 끊겼거나 이 scope 의 ring 이 없거나 구간과 겹치지 않으면 None (전체 HTTP 조회)
+        - 시작 시각 > start 이면 [start, 시작 시각) 은 호출 측에서 HTTP 로 채움
+        """
+        ring = self.rings.get(key) if self.connected else None
+        if ring is None or ring.covered_from >= end:
+            self.windows["fallback"] += 1
+            return None
+
+        covered_from = max(start, ring.covered_from)
+        self.windows["ring" if covered_from == start else "partial"] += 1
+        return ring.frame(covered_from, end), covered_from
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "devices": len(self.rings),
+            "messages": self.messages,
+            "readings": self.readings,
+            "rejected": self.rejected,
+            "reconnects": self.reconnects,
+            "windows": dict(self.windows),
+            "bytes": sum(ring.nbytes for ring in self.rings.values()),
+        }
+
+
+def _metric_row(item: dict) -> Optional[np.ndarray]:
+    source = item.get("metrics") or item.get("values") or item
+    if not isinstance(source, dict):
+        return None
+
+    row = np.full(len(METRIC_KEYS), np.nan, dtype=np.float64)
+    found = False
+    for j, key in enumerate(METRIC_KEYS):
+        value = source.get(key)
+        if isinstance(value, dict):
+            value = value.get("value")
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            row[j] = value
+            found = True
+    return row if found else None
+
+
+def _timestamp(item: dict, default: float) -> float:
+    for key in TIMESTAMP_KEYS:
+        value = item.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value / 1000.0 if value > 1e11 else float(value)     # epoch milliseconds
+    return default
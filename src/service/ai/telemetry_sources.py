@@ -0,0 +1,240 @@
+# service/ai/telemetry_sources.py
+#
+# telemetry push 수신 source (MQTT / AMQP / 프로세스 내 fake broker)
+# - 공통 인터페이스: await start(on_message, on_connect, on_disconnect), await stop()
+#   콜백은 모두 이벤트 루프 쓰레드에서 호출 (on_message(topic, payload bytes))
+# - paho-mqtt / aio-pika 는 해당 source 를 시작할 때만 import
+# - 워커가 여러 개면 워커마다 모든 메시지를 받아야 하므로
+#   MQTT 는 워커별 client id, AMQP 는 워커별 exclusive queue 를 topic exchange 에 bind
+# - FakeBroker: 테스트 / 로컬 개발용 (MQTT 스타일 wildcard, publish 즉시 같은 쓰레드에서 전달)
+
+import asyncio
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+import orjson
+
+from common.startup_report import STARTUP
+
+OnMessage = Callable[[str, bytes], None]
+OnEvent = Callable[[], None]
+
+
+class TopicTemplate:
+    """
+    "bangtori/{homeId}/{deviceId}/telemetry" 형태의 topic 템플릿
+    - pattern: {..} 자리를 wildcard 로 바꾼 구독 패턴 ("bangtori/+/+/telemetry")
+    - match(topic): {..} 자리의 값 추출 (형식이 다르면 None)
+    """
+
+    def __init__(self, template: str, sep: str = "/", single: str = "+", multi: str = "#"):
+        self.template = template
+        self.sep = sep
+        self.single = single
+        self.multi = multi
+        self._parts = template.split(sep)
+        self.pattern = sep.join(single if _field(p) else p for p in self._parts)
+
+    def match(self, topic: str) -> Optional[Dict[str, str]]:
+        parts = topic.split(self.sep)
+        if len(parts) != len(self._parts):
+            return None
+
+        ids = {}
+        for expected, actual in zip(self._parts, parts):
+            name = _field(expected)
+            if name:
+                ids[name] = actual
+            elif expected != actual:
+                return None
+        return ids
+
+
+def _field(part: str) -> Optional[str]:
+    if len(part) > 2 and part[0] == "{" and part[-1] == "}":
+        return part[1:-1]
+    return None
+
+
+def topic_matches(pattern: str, topic: str, sep: str = "/", single: str = "+", multi: str = "#") -> bool:
+    p_parts, t_parts = pattern.split(sep), topic.split(sep)
+    for i, p in enumerate(p_parts):
+        if p == multi:
+            return True
+        if i >= len(t_parts) or (p != single and p != t_parts[i]):
+            return False
+    return len(p_parts) == len(t_parts)
+
+
+# ------------------------
+# 프로세스 내 fake broker
+# ------------------------
+class FakeBroker:
+    def __init__(self):
+        self._subs: List[Tuple[str, OnMessage]] = []
+        self.published = 0
+
+    def subscribe(self, pattern: str, callback: OnMessage) -> OnEvent:
+        entry = (pattern, callback)
+        self._subs.append(entry)
+        return lambda: self._subs.remove(entry)
+
+    def publish(self, topic: str, payload) -> int:
+        """구독자 수 반환 (payload 가 bytes 가 아니면 orjson 으로 직렬화)"""
+        if not isinstance(payload, (bytes, bytearray)):
+            payload = orjson.dumps(payload)
+        self.published += 1
+
+        delivered = 0
+        for pattern, callback in list(self._subs):
+            if topic_matches(pattern, topic):
+                callback(topic, bytes(payload))
+                delivered += 1
+        return delivered
+
+
+class FakeSource:
+    transport = "fake"
+
+    def __init__(self, pattern: str, broker: Optional[FakeBroker] = None):
+        self.pattern = pattern
+        self.broker = broker or FakeBroker()
+        self._unsubscribe: Optional[OnEvent] = None
+        self._on_connect: Optional[OnEvent] = None
+        self._on_disconnect: Optional[OnEvent] = None
+
+    async def start(self, on_message: OnMessage, on_connect: OnEvent, on_disconnect: OnEvent) -> None:
+        self._on_connect, self._on_disconnect = on_connect, on_disconnect
+        self._unsubscribe = self.broker.subscribe(self.pattern, on_message)
+        on_connect()
+
+    def drop(self) -> None:
+        """연결 끊김 흉내 (reconnect 전까지 메시지 유실 구간)"""
+        self._on_disconnect()
+
+    def reconnect(self) -> None:
+        self._on_connect()
+
+    async def stop(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+
+# ------------------------
+# MQTT (paho-mqtt)
+# ------------------------
+class MQTTSource:
+    transport = "mqtt"
+
+    def __init__(self, url: str, pattern: str, qos: int = 0, keepalive: int = 30):
+        self.url = url
+        self.pattern = pattern
+        self.qos = qos
+        self.keepalive = keepalive
+        self.client_id = f"bangtori-ai-{os.getpid()}"
+        self._client = None
+
+    async def start(self, on_message: OnMessage, on_connect: OnEvent, on_disconnect: OnEvent) -> None:
+        mqtt = await asyncio.to_thread(STARTUP.timed_import, "paho.mqtt.client")
+        loop = asyncio.get_running_loop()
+
+        try:
+            client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, client_id=self.client_id)
+        except AttributeError:      # paho-mqtt 1.x
+            client = mqtt.Client(client_id=self.client_id)
+
+        url = urlparse(self.url)
+        tls = url.scheme in ("mqtts", "ssl")
+        if url.username:
+            client.username_pw_set(unquote(url.username), unquote(url.password) if url.password else None)
+        if tls:
+            client.tls_set()
+
+        # 콜백은 paho 네트워크 쓰레드에서 호출 → 이벤트 루프로 넘김
+        # (1.x: (client, userdata, flags, rc) / 2.x: (client, userdata, flags, reason_code, properties))
+        def _on_connect(client, userdata, flags, rc, properties=None):
+            if rc == 0:
+                client.subscribe(self.pattern, qos=self.qos)
+                loop.call_soon_threadsafe(on_connect)
+
+        def _on_disconnect(client, userdata, *args):
+            loop.call_soon_threadsafe(on_disconnect)
+
+        def _on_message(client, userdata, msg):
+            loop.call_soon_threadsafe(on_message, msg.topic, msg.payload)
+
+        client.on_connect = _on_connect
+        client.on_disconnect = _on_disconnect
+        client.on_message = _on_message
+        client.reconnect_delay_set(min_delay=1, max_delay=30)
+
+        # 연결 / 재연결은 paho 쓰레드가 처리 (broker 가 없어도 startup 은 막지 않음)
+        client.connect_async(url.hostname or "localhost", url.port or (8883 if tls else 1883), self.keepalive)
+        client.loop_start()
+        self._client = client
+
+    async def stop(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            client.disconnect()
+            await asyncio.to_thread(client.loop_stop)
+
+
+# ------------------------
+# AMQP (aio-pika)
+# ------------------------
+class AMQPSource:
+    transport = "amqp"
+
+    def __init__(self, url: str, exchange: str, pattern: str, prefetch: int = 256):
+        self.url = url
+        self.exchange = exchange
+        self.pattern = pattern
+        self.prefetch = prefetch
+        self._conn = None
+
+    async def start(self, on_message: OnMessage, on_connect: OnEvent, on_disconnect: OnEvent) -> None:
+        aio_pika = await asyncio.to_thread(STARTUP.timed_import, "aio_pika")
+
+        async def _deliver(message) -> None:
+            on_message(message.routing_key, message.body)
+
+        # robust 연결: 끊기면 재연결 후 channel / queue / consumer 복구
+        conn = await aio_pika.connect_robust(self.url)
+        conn.close_callbacks.add(lambda *_: on_disconnect())
+        conn.reconnect_callbacks.add(lambda *_: on_connect())
+        self._conn = conn
+
+        channel = await conn.channel()
+        await channel.set_qos(prefetch_count=self.prefetch)
+        exchange = await channel.declare_exchange(self.exchange, aio_pika.ExchangeType.TOPIC, durable=True)
+        # 워커별 임시 queue (이름은 broker 가 지정, 연결이 끊기면 삭제) → 모든 워커가 전체 메시지 수신
+        queue = await channel.declare_queue(exclusive=True, auto_delete=True)
+        await queue.bind(exchange, routing_key=self.pattern)
+        # ring 은 메모리에만 있으므로 ack 없이 수신 (유실 구간은 covered_from 으로 처리)
+        await queue.consume(_deliver, no_ack=True)
+        on_connect()
+
+    async def stop(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            await conn.close()
+
+
+def create_source(
+    transport: str, url: str, topic: str, exchange: str = "telemetry", qos: int = 0,
+    broker: Optional[FakeBroker] = None,
+):
+    """(source, TopicTemplate) - AMQP routing key 는 "." 구분 / "*" wildcard"""
+    if transport == "mqtt":
+        template = TopicTemplate(topic)
+        return MQTTSource(url, template.pattern, qos), template
+    if transport == "amqp":
+        template = TopicTemplate(topic, sep=".", single="*")
+        return AMQPSource(url, exchange, template.pattern), template
+    if transport == "fake":
+        template = TopicTemplate(topic)
+        return FakeSource(template.pattern, broker), template
+    raise ValueError(f"Unsupported telemetry ingest transport: {transport}")
@@ -1,8 +1,10 @@
 # service/api/basic_api.py
 
 from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
 
 import src.common.common_codes as codes
+from common.responses import ORJSONResponse
 from service.basic import basic_service
 
 # 라우터 등록은 여기서 하고 실제 로직은 service에서 관리
@@ -13,4 +15,17 @@ router = APIRouter(tags=["Basic"])  # prefix 삭제
 @router.get("/ping")
 async def ping(request: Request):
     ctx = request.app.state.ctx
-    return basic_service.ping(ctx)
+    return ORJSONResponse(basic_service.ping(ctx))
+
+# GET /ready (readiness: 시작 직후 warmup 이 끝나기 전에는 503)
+@router.get("/ready")
+async def ready(request: Request):
+    ctx = request.app.state.ctx
+    body = basic_service.readiness(ctx)
+    return ORJSONResponse(body, status_code=200 if body["ready"] else 503)
+
+# GET /metrics (Prometheus text format)
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request):
+    ctx = request.app.state.ctx
+    return PlainTextResponse(ctx.metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,15 +1,25 @@
 
 # service/scripts/basic_service.py
 
-from datetime import datetime
-import time, uuid, orjson
+from common.id_generator import generate_task_id
+from common.trace_context import current_trace_id
 
 def ping(ctx):
-    tid = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    # 요청 trace id 재사용 (미들웨어 밖에서 호출된 경우에만 새로 생성)
+    tid = current_trace_id() or generate_task_id()
     ctx.log.debug(f"📡 Ping requested in service layer | tid={tid}")
 
     return {
         "status": "pong",
         "message": "Hello from basic_service",
         "tid": tid
-    }
\ No newline at end of file
+    }
+
+
+def readiness(ctx):
+    # liveness(/ping) 와 달리 warmup 까지 끝나야 ready
+    return {
+        "ready": ctx.ready,
+        "components": dict(ctx.readiness),
+        "startup": ctx.startup.as_dict(),
+    }